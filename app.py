@@ -3,20 +3,60 @@ Flask Web Application for Nigerian Bank Statement Transformer
 Optimized for M4 MacBook with PyCharm
 """
 
-from flask import Flask, request, jsonify, render_template_string, send_file
+from flask import Flask, Response, request, jsonify, send_file
+from flask_compress import Compress
 from werkzeug.utils import secure_filename
 import os
+import json
+import multiprocessing
 import tempfile
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-import uuid
+from urllib.parse import unquote
+import xxhash
 from bank_transformer import BankStatementTransformer
+from celery import Celery
 import logging
 import pandas as pd
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
-app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
+app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER') or tempfile.mkdtemp()  # Shared with Celery workers
+app.config['TRANSFORM_EXECUTOR'] = os.environ.get('TRANSFORM_EXECUTOR', 'thread')  # 'thread' or 'process'
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+# Let the front-end server send downloads instead of streaming them through Python.
+# Apache: enable mod_xsendfile and set USE_X_SENDFILE=true.
+# nginx: set X_ACCEL_REDIRECT_PREFIX=/protected/ and add
+#     location /protected/ { internal; alias <UPLOAD_FOLDER>/; }
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+app.config['X_ACCEL_REDIRECT_PREFIX'] = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+
+# Compress text responses (the page and the preview JSON)
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'text/css', 'application/javascript']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['br', 'gzip']  # send_static_file responses are streamed
+Compress(app)
+
+# Background jobs (transforms run inline when no broker is configured)
+app.config['CELERY_BROKER_URL'] = os.environ.get('CELERY_BROKER_URL')  # e.g. redis://localhost:6379/0
+app.config['CELERY_RESULT_BACKEND'] = os.environ.get('CELERY_RESULT_BACKEND', app.config['CELERY_BROKER_URL'])
+
+celery = Celery(
+    app.import_name,
+    broker=app.config['CELERY_BROKER_URL'],
+    backend=app.config['CELERY_RESULT_BACKEND']
+)
 
 # Initialize transformer
 transformer = BankStatementTransformer()
@@ -26,536 +66,316 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Allowed file extensions
-ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'ods'}
+ALLOWED_EXTENSIONS = frozenset({'xlsx', 'xls', 'ods'})
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Number of transactions shown in the preview modal
+PREVIEW_ROWS = 20
+
+# Cap on file names returned by the debug and download error responses
+MAX_LISTED_FILES = 100
+
+# Browser cache lifetime for the front end, in seconds
+STATIC_MAX_AGE = 3600
+
+# Upper bound on files transformed in parallel per request
+MAX_TRANSFORM_WORKERS = 8
+
+# Files above this size are streamed to /api/transform_stream one at a time
+STREAM_UPLOAD_THRESHOLD = 5 * 1024 * 1024  # Keep in sync with static/index.html
+STREAM_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Files in the upload folder older than this are removed by the janitor thread, in seconds
+UPLOAD_TTL_SECONDS = 30 * 60
+JANITOR_INTERVAL = 60
+JANITOR_LOCK_NAME = '.janitor.lock'  # Ends in .lock, so the janitor never expires it
+
+# Excel engine used to read standardized files (calamine is much faster)
+try:
+    import python_calamine  # noqa: F401
+    PREVIEW_ENGINE = 'calamine'
+except ImportError:
+    PREVIEW_ENGINE = 'openpyxl'
 
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-
-# HTML Template
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Nigerian Financial Intelligence Agency - Bank Statement Transformer</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container { 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            background: white; 
-            border-radius: 15px; 
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header { 
-            background: #2c3e50; 
-            color: white; 
-            padding: 30px; 
-            text-align: center; 
-        }
-        .header h1 { font-size: 2.2em; margin-bottom: 10px; }
-        .header p { opacity: 0.9; font-size: 1.1em; }
-        .main-content { padding: 40px; }
-        .upload-section { 
-            border: 3px dashed #ddd; 
-            border-radius: 10px; 
-            padding: 40px; 
-            text-align: center; 
-            margin-bottom: 30px;
-            transition: all 0.3s ease;
-        }
-        .upload-section:hover { border-color: #667eea; background: #f8f9ff; }
-        .upload-section input[type="file"] { 
-            width: 100%; 
-            padding: 15px; 
-            border: 2px solid #ddd; 
-            border-radius: 8px; 
-            font-size: 16px;
-            margin: 15px 0;
-        }
-        .btn { 
-            background: #667eea; 
-            color: white; 
-            padding: 15px 30px; 
-            border: none; 
-            border-radius: 8px; 
-            font-size: 16px; 
-            cursor: pointer; 
-            transition: all 0.3s ease;
-            margin: 5px;
-        }
-        .btn:hover { background: #5a67d8; transform: translateY(-2px); }
-        .btn:disabled { background: #ccc; cursor: not-allowed; }
-        .btn-small {
-            padding: 8px 15px;
-            font-size: 12px;
-        }
-        .btn-preview {
-            background: #17a2b8;
-        }
-        .btn-preview:hover {
-            background: #138496;
-        }
-        .btn-download {
-            background: #28a745;
-        }
-        .btn-download:hover {
-            background: #218838;
-        }
-        .results { 
-            margin-top: 30px; 
-            padding: 20px; 
-            background: #f8f9fa; 
-            border-radius: 10px; 
-            display: none;
-        }
-        .success { color: #28a745; }
-        .error { color: #dc3545; }
-        .file-item { 
-            background: white; 
-            padding: 15px; 
-            margin: 10px 0; 
-            border-radius: 8px; 
-            border-left: 4px solid #667eea;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .progress { 
-            width: 100%; 
-            height: 20px; 
-            background: #e9ecef; 
-            border-radius: 10px; 
-            overflow: hidden; 
-            margin: 10px 0;
-            display: none;
-        }
-        .progress-bar { 
-            height: 100%; 
-            background: #28a745; 
-            transition: width 0.3s ease;
-        }
-        .config-section {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        .config-row {
-            display: flex;
-            gap: 20px;
-            margin-bottom: 15px;
-        }
-        .config-item {
-            flex: 1;
-        }
-        .config-item label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: 600;
-            color: #2c3e50;
-        }
-        .config-item select, .config-item input {
-            width: 100%;
-            padding: 10px;
-            border: 2px solid #ddd;
-            border-radius: 5px;
-            font-size: 14px;
-        }
-        .status-badge {
-            padding: 5px 10px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 600;
-        }
-        .status-success { background: #d4edda; color: #155724; }
-        .status-processing { background: #fff3cd; color: #856404; }
-        .status-error { background: #f8d7da; color: #721c24; }
-
-        /* Preview Modal Styles */
-        .modal {
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0,0,0,0.5);
-        }
-        .modal-content {
-            background-color: white;
-            margin: 2% auto;
-            padding: 0;
-            border-radius: 10px;
-            width: 95%;
-            max-width: 1100px;
-            max-height: 90vh;
-            overflow: hidden;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-        }
-        .modal-header {
-            background: #2c3e50;
-            color: white;
-            padding: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .modal-header h3 {
-            margin: 0;
-        }
-        .close {
-            background: none;
-            border: none;
-            color: white;
-            font-size: 28px;
-            font-weight: bold;
-            cursor: pointer;
-        }
-        .close:hover {
-            opacity: 0.7;
-        }
-        .modal-body {
-            padding: 20px;
-            max-height: 70vh;
-            overflow-y: auto;
-        }
-        .preview-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }
-        .preview-table th,
-        .preview-table td {
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-            font-size: 12px;
-        }
-        .preview-table th {
-            background-color: #f8f9fa;
-            font-weight: 600;
-            position: sticky;
-            top: 0;
-            z-index: 10;
-        }
-        .preview-table tr:nth-child(even) {
-            background-color: #f9f9f9;
-        }
-        .preview-info {
-            background: #e3f2fd;
-            padding: 15px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-        }
-        .loading {
-            text-align: center;
-            padding: 40px;
-        }
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #667eea;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 20px;
-        }
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🏛️ Nigerian Financial Intelligence Agency</h1>
-            <p>Bank Statement Standardization System</p>
-            <p>🔒 Secure • ⚡ Fast • 📊 Standardized</p>
-        </div>
-
-        <div class="main-content">
-            <!-- Configuration Section -->
-            <div class="config-section">
-                <h3 style="margin-bottom: 15px; color: #2c3e50;">⚙️ Processing Configuration</h3>
-                <div class="config-row">
-                    <div class="config-item">
-                        <label for="dateFormat">Date Format:</label>
-                        <select id="dateFormat">
-                            <option value="DD/MM/YYYY">DD/MM/YYYY (Nigerian Standard)</option>
-                            <option value="MM/DD/YYYY">MM/DD/YYYY (US Format)</option>
-                            <option value="YYYY-MM-DD">YYYY-MM-DD (ISO Format)</option>
-                        </select>
-                    </div>
-                    <div class="config-item">
-                        <label for="currency">Currency:</label>
-                        <select id="currency">
-                            <option value="NGN">Nigerian Naira (₦)</option>
-                            <option value="USD">US Dollar ($)</option>
-                            <option value="GBP">British Pound (£)</option>
-                        </select>
-                    </div>
-                    <div class="config-item">
-                        <label for="includeMetadata">Include Metadata:</label>
-                        <input type="checkbox" id="includeMetadata" checked> Account info & summary
-                    </div>
-                </div>
-            </div>
-
-            <!-- Upload Section -->
-            <div class="upload-section">
-                <h3>📤 Upload Bank Statements</h3>
-                <p>Supports XLSX, XLS, and ODS formats from Nigerian banks</p>
-                <input type="file" id="fileInput" multiple accept=".xlsx,.xls,.ods">
-                <div class="progress" id="progressBar">
-                    <div class="progress-bar" style="width: 0%"></div>
-                </div>
-                <button class="btn" id="uploadBtn" onclick="processFiles()">Transform Files</button>
-            </div>
-
-            <!-- Results Section -->
-            <div class="results" id="results">
-                <h3>📋 Processing Results</h3>
-                <div id="fileResults"></div>
-            </div>
-        </div>
-    </div>
-
-    <!-- Preview Modal -->
-    <div id="previewModal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <h3>📊 File Preview</h3>
-                <button class="close" onclick="closePreview()">&times;</button>
-            </div>
-            <div class="modal-body" id="previewContent">
-                <div class="loading">
-                    <div class="spinner"></div>
-                    <p>Loading preview...</p>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let uploadedFiles = [];
-
-        document.getElementById('fileInput').addEventListener('change', function(e) {
-            uploadedFiles = Array.from(e.target.files);
-            updateFileDisplay();
-        });
-
-        function updateFileDisplay() {
-            const resultsDiv = document.getElementById('results');
-            const fileResultsDiv = document.getElementById('fileResults');
-
-            if (uploadedFiles.length > 0) {
-                resultsDiv.style.display = 'block';
-                fileResultsDiv.innerHTML = `
-                    <h4>📁 Selected Files (${uploadedFiles.length})</h4>
-                    ${uploadedFiles.map(file => `
-                        <div class="file-item">
-                            <div>
-                                <strong>${file.name}</strong><br>
-                                <small>${(file.size / 1024 / 1024).toFixed(2)} MB</small>
-                            </div>
-                            <span class="status-badge status-processing">Ready</span>
-                        </div>
-                    `).join('')}
-                `;
-            }
-        }
+    """Check the extension of an already secured filename"""
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
 
-        async function processFiles() {
-            if (uploadedFiles.length === 0) {
-                alert('Please select files first!');
-                return;
-            }
 
-            const uploadBtn = document.getElementById('uploadBtn');
-            const progressBar = document.getElementById('progressBar');
-            const progressBarInner = progressBar.querySelector('.progress-bar');
-
-            uploadBtn.disabled = true;
-            uploadBtn.textContent = 'Processing...';
-            progressBar.style.display = 'block';
-
-            const formData = new FormData();
-            uploadedFiles.forEach(file => formData.append('files', file));
-
-            // Add configuration
-            formData.append('date_format', document.getElementById('dateFormat').value);
-            formData.append('currency', document.getElementById('currency').value);
-            formData.append('include_metadata', document.getElementById('includeMetadata').checked);
-
-            try {
-                progressBarInner.style.width = '30%';
-
-                const response = await fetch('/api/transform', {
-                    method: 'POST',
-                    body: formData
-                });
-
-                progressBarInner.style.width = '90%';
-                const result = await response.json();
-                progressBarInner.style.width = '100%';
-
-                displayResults(result);
-
-            } catch (error) {
-                console.error('Error:', error);
-                alert('Processing failed: ' + error.message);
-            } finally {
-                uploadBtn.disabled = false;
-                uploadBtn.textContent = 'Transform Files';
-                setTimeout(() => {
-                    progressBar.style.display = 'none';
-                }, 1000);
-            }
-        }
+@app.route('/')
+def index():
+    """Main page (static, see static/index.html)"""
+    return app.send_static_file('index.html')
 
-        function displayResults(result) {
-            const fileResultsDiv = document.getElementById('fileResults');
-
-            if (result.success) {
-                fileResultsDiv.innerHTML = `
-                    <h4 class="success">✅ Processing Complete!</h4>
-                    ${result.results.map(fileResult => `
-                        <div class="file-item">
-                            <div>
-                                <strong>${fileResult.metadata?.file_name || fileResult.file_name || 'Unknown'}</strong><br>
-                                <small>${fileResult.success ? 
-                                    `${fileResult.records_processed} records processed (${fileResult.original_format})` : 
-                                    `Error: ${fileResult.error}`
-                                }</small>
-                            </div>
-                            <div>
-                                <span class="status-badge ${fileResult.success ? 'status-success' : 'status-error'}">
-                                    ${fileResult.success ? 'Success' : 'Failed'}
-                                </span>
-                                ${fileResult.success && fileResult.output_file ? 
-                                    `<button class="btn btn-preview btn-small" onclick="previewFile('${fileResult.output_file}', '${fileResult.metadata?.file_name || fileResult.file_name}')">👁️ Preview</button>
-                                     <button class="btn btn-download btn-small" onclick="downloadFile('${fileResult.output_file}')">📥 Download</button>` : 
-                                    ''
-                                }
-                            </div>
-                        </div>
-                    `).join('')}
-                `;
-            } else {
-                fileResultsDiv.innerHTML = `
-                    <div class="error">❌ Processing failed: ${result.error}</div>
-                `;
-            }
-        }
 
-        async function previewFile(fileName, originalName) {
-            const modal = document.getElementById('previewModal');
-            const content = document.getElementById('previewContent');
-
-            // Show modal with loading
-            modal.style.display = 'block';
-            content.innerHTML = `
-                <div class="loading">
-                    <div class="spinner"></div>
-                    <p>Loading preview for ${originalName}...</p>
-                </div>
-            `;
-
-            try {
-                const response = await fetch(`/api/preview/${encodeURIComponent(fileName)}`);
-                const result = await response.json();
-
-                if (result.success) {
-                    content.innerHTML = `
-                        <div class="preview-info">
-                            <h4>📄 ${originalName}</h4>
-                            <p><strong>Format:</strong> ${result.format} → Standardized</p>
-                            <p><strong>Total Records:</strong> ${result.total_records}</p>
-                            <p><strong>Account:</strong> ${result.account_info.account_name || 'N/A'} (${result.account_info.account_number || 'N/A'})</p>
-                            <p><strong>Date Range:</strong> ${result.date_range || 'N/A'}</p>
-                            <p><em>Showing first 20 transactions:</em></p>
-                        </div>
-                        <div style="overflow-x: auto;">
-                            <table class="preview-table">
-                                <thead>
-                                    <tr>
-                                        ${result.headers.map(header => `<th>${header}</th>`).join('')}
-                                    </tr>
-                                </thead>
-                                <tbody>
-                                    ${result.data.map(row => 
-                                        `<tr>${result.headers.map(header => `<td>${row[header] || ''}</td>`).join('')}</tr>`
-                                    ).join('')}
-                                </tbody>
-                            </table>
-                        </div>
-                        ${result.total_records > 20 ? `<p style="margin-top: 15px; color: #666;"><em>... and ${result.total_records - 20} more transactions. Download the full file to see all records.</em></p>` : ''}
-                    `;
-                } else {
-                    content.innerHTML = `
-                        <div class="error">❌ Failed to load preview: ${result.error}</div>
-                    `;
-                }
-            } catch (error) {
-                content.innerHTML = `
-                    <div class="error">❌ Failed to load preview: ${error.message}</div>
-                `;
-            }
-        }
+@app.after_request
+def add_cache_headers(response):
+    """Let browsers cache the static front end"""
+    if request.endpoint in ('index', 'static'):
+        response.headers['Cache-Control'] = f"public, max-age={STATIC_MAX_AGE}"
+    return response
 
-        function closePreview() {
-            document.getElementById('previewModal').style.display = 'none';
+
+def _too_large_response():
+    """JSON response for uploads over MAX_CONTENT_LENGTH"""
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'success': False, 'error': f'Upload too large (max {limit_mb}MB)'}), 413
+
+
+@app.errorhandler(413)
+def request_entity_too_large(error):
+    """Return JSON instead of the default HTML page for oversize uploads"""
+    return _too_large_response()
+
+
+def _upload_exceeds_limit():
+    """Check the declared Content-Length before any of the body is read"""
+    content_length = request.content_length
+    return bool(content_length) and content_length > app.config['MAX_CONTENT_LENGTH']
+
+
+def _gevent_patched():
+    """Whether gevent has monkey-patched threading (gunicorn gevent workers)"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def _in_daemon_process():
+    """Whether this is a daemonic process (e.g. a Celery prefork child), which cannot start children"""
+    if multiprocessing.current_process().daemon:
+        return True
+
+    try:
+        from billiard.process import current_process as billiard_current_process
+    except ImportError:
+        return False
+    return bool(billiard_current_process().daemon)
+
+
+def _create_executor(max_workers):
+    """Create the pool used to transform uploaded files"""
+    if app.config['TRANSFORM_EXECUTOR'] == 'process' and not _in_daemon_process():
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+    if _gevent_patched():
+        # Patched threads are greenlets, so a CPU-bound transform would stall every
+        # connection in the worker; gevent's executor always uses native threads
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor(max_workers=max_workers)
+
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def _save_upload(stream, filename, upload_folder):
+    """Stream an upload to disk in chunks, hashing it on the way.
+
+    Returns the saved path and the xxh3 digest of the contents.
+    """
+    digest = xxhash.xxh3_64()
+
+    with tempfile.NamedTemporaryFile(dir=upload_folder, suffix=Path(filename).suffix, delete=False) as upload:
+        for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            upload.write(chunk)
+
+    return upload.name, digest.hexdigest()
+
+
+def _output_key(digest, options):
+    """Key of a standardized file: the upload's digest plus the options it was transformed with"""
+    return xxhash.xxh3_64_hexdigest(f"{digest}:{json.dumps(options, sort_keys=True)}".encode())
+
+
+def _cached_result(original_name, output_filename, output_path, options):
+    """Return the stored result for an identical earlier upload, if any.
+
+    The result has the same shape as a fresh one; its transactions are read
+    back from the parquet copy, so pass-through cells (e.g. a numeric Ref. No)
+    come back as text.
+    """
+    metadata_path = _sidecar_path(output_path, 'meta')
+    parquet_path = _parquet_path(output_path)
+    if not all(os.path.exists(path) for path in (output_path, metadata_path, parquet_path)):
+        return None
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+
+    if metadata.get('options') != options:
+        return None
+
+    # Restart the janitor's expiry clock for everything the reused result points at
+    try:
+        for path in (output_path, parquet_path, metadata_path):
+            os.utime(path)
+    except FileNotFoundError:
+        return None  # Expired while we were looking at it
+
+    preview_path = _sidecar_path(output_path, 'preview')
+    if os.path.exists(preview_path):
+        os.utime(preview_path)
+
+    return {
+        'success': True,
+        'account_info': metadata['account_info'],
+        'transactions': _read_transactions(output_path),
+        'original_format': metadata['original_format'],
+        'records_processed': metadata['records_processed'],
+        'metadata': {**metadata, 'file_name': original_name},
+        'output_file': output_filename,
+        'download_ready': True,
+        'cached': True
+    }
+
+
+def _process_saved_file(original_name, filename, file_path, digest, upload_folder, options):
+    """Transform one saved upload and generate its standardized file"""
+    try:
+        # Standardized files are addressed by the hash of the uploaded bytes and the options
+        output_filename = f"standardized_{_output_key(digest, options)}.xlsx"
+        output_path = os.path.join(upload_folder, output_filename)
+        download_name = f"standardized_{Path(filename).stem}.xlsx"
+
+        cached = _cached_result(original_name, output_filename, output_path, options)
+        if cached is not None:
+            logger.info(f"♻️  Reusing standardized file for {original_name}: {output_path}")
+            cached['download_name'] = download_name
+            return cached
+
+        logger.info(f"Processing file: {file_path}")
+
+        # Process the file
+        result = transformer.transform_statement(file_path, options)
+
+        # Report the uploaded name rather than the temporary file name
+        if result['success']:
+            result['metadata']['file_name'] = original_name
+        else:
+            result['file_name'] = original_name
+
+        if result['success']:
+            # Generate standardized output file
+            logger.info(f"Generating output file: {output_path}")
+
+            # Generate the standardized file and its companions under temporary names, then
+            # move them into place atomically, the xlsx last: concurrent uploads never see a
+            # partial file, and an xlsx is never visible without its sidecars
+            partial_fd, partial_path = tempfile.mkstemp(dir=upload_folder, suffix='.xlsx')
+            os.close(partial_fd)
+            try:
+                transformer.generate_standardized_file(result, partial_path, options)
+                _write_metadata_sidecar(result, partial_path, options)
+                _write_preview_sidecar(result, partial_path)
+
+                for partial, final in zip(_companion_paths(partial_path), _companion_paths(output_path)):
+                    if os.path.exists(partial):
+                        os.replace(partial, final)
+                os.replace(partial_path, output_path)
+            finally:
+                for path in (partial_path, *_companion_paths(partial_path)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+            # Verify file was created
+            if os.path.exists(output_path):
+                result['output_file'] = output_filename
+                result['download_name'] = download_name
+                result['download_ready'] = True
+                file_size = os.path.getsize(output_path)
+                logger.info(f"✅ Generated standardized file: {output_path} ({file_size} bytes)")
+            else:
+                logger.error(f"❌ Failed to generate output file: {output_path}")
+                result['success'] = False
+                result['error'] = "Failed to generate standardized file"
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Error processing file {original_name}: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'file_name': original_name
         }
 
-        // Close modal when clicking outside
-        window.onclick = function(event) {
-            const modal = document.getElementById('previewModal');
-            if (event.target === modal) {
-                modal.style.display = 'none';
+    finally:
+        # Clean up input file
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def _transform_saved_files(results, saved_files, upload_folder, options):
+    """Transform saved uploads concurrently and build the API response"""
+    results = list(results)
+
+    if saved_files:
+        with _create_executor(min(MAX_TRANSFORM_WORKERS, len(saved_files))) as executor:
+            futures = {
+                executor.submit(
+                    _process_saved_file, original_name, filename, file_path, digest, upload_folder, options
+                ): index
+                for index, original_name, filename, file_path, digest in saved_files
             }
-        }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
-        function downloadFile(fileName) {
-            const downloadUrl = `/api/download/${encodeURIComponent(fileName)}`;
-            console.log('Downloading:', downloadUrl);
-
-            // Create invisible download link
-            const link = document.createElement('a');
-            link.href = downloadUrl;
-            link.download = fileName;
-            document.body.appendChild(link);
-            link.click();
-            document.body.removeChild(link);
-        }
-    </script>
-</body>
-</html>
-"""
+    total_processed = sum(1 for r in results if r['success'])
 
+    return {
+        'success': True,
+        'results': results,
+        'total_processed': total_processed,
+        'total_failed': len(results) - total_processed
+    }
+
+
+def _transform_options(values):
+    """Read transform options from form fields or query arguments"""
+    return {
+        'date_format': values.get('date_format', 'DD/MM/YYYY'),
+        'currency': values.get('currency', 'NGN'),
+        'include_metadata': values.get('include_metadata', 'false').lower() == 'true'
+    }
+
+
+def _dispatch_transform(results, saved_files, options):
+    """Run the batch inline, or hand it to a Celery worker when a broker is configured"""
+    if app.config['CELERY_BROKER_URL']:
+        job = transform_task.delay(results, saved_files, app.config['UPLOAD_FOLDER'], options)
+        return jsonify({'success': True, 'job_id': job.id}), 202
+
+    return jsonify(_transform_saved_files(results, saved_files, app.config['UPLOAD_FOLDER'], options))
 
-@app.route('/')
-def index():
-    """Main page"""
-    return render_template_string(HTML_TEMPLATE)
+
+@celery.task(name='financebot.transform')
+def transform_task(results, saved_files, upload_folder, options):
+    """Celery task running the transform batch outside the web worker.
+
+    Transactions stay in their parquet copies rather than the result backend;
+    /api/job/<id> reads them back.
+    """
+    response = _transform_saved_files(results, saved_files, upload_folder, options)
+    for result in response['results']:
+        output_file = result.get('output_file')
+        if output_file and os.path.exists(_parquet_path(os.path.join(upload_folder, output_file))):
+            result.pop('transactions', None)
+    return response
 
 
 @app.route('/api/transform', methods=['POST'])
 def transform_statements():
     """API endpoint to transform bank statements"""
     try:
+        # Reject oversize uploads before multipart parsing starts
+        if _upload_exceeds_limit():
+            return _too_large_response()
+
         if 'files' not in request.files:
             return jsonify({'success': False, 'error': 'No files uploaded'})
 
@@ -564,116 +384,236 @@ def transform_statements():
             return jsonify({'success': False, 'error': 'No files selected'})
 
         # Get configuration options
-        options = {
-            'date_format': request.form.get('date_format', 'DD/MM/YYYY'),
-            'currency': request.form.get('currency', 'NGN'),
-            'include_metadata': request.form.get('include_metadata', 'false').lower() == 'true'
-        }
+        options = _transform_options(request.form)
 
-        results = []
+        results = [None] * len(files)
+        saved_files = []
 
-        for file in files:
-            if file and allowed_file(file.filename):
+        for index, file in enumerate(files):
+            filename = secure_filename(file.filename) if file else ''
+            if allowed_file(filename):
                 try:
                     # Save uploaded file temporarily
-                    filename = secure_filename(file.filename)
-                    unique_filename = f"{uuid.uuid4()}_{filename}"
-                    file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                    file.save(file_path)
-
-                    logger.info(f"Processing file: {file_path}")
-
-                    # Process the file
-                    result = transformer.transform_statement(file_path, options)
-
-                    if result['success']:
-                        # Generate standardized output file
-                        output_filename = f"standardized_{filename}"
-                        output_path = os.path.join(app.config['UPLOAD_FOLDER'], output_filename)
-
-                        logger.info(f"Generating output file: {output_path}")
-
-                        # Generate the standardized file
-                        transformer.generate_standardized_file(result, output_path, options)
-
-                        # Verify file was created
-                        if os.path.exists(output_path):
-                            result['output_file'] = output_filename
-                            result['download_ready'] = True
-                            file_size = os.path.getsize(output_path)
-                            logger.info(f"✅ Generated standardized file: {output_path} ({file_size} bytes)")
-                        else:
-                            logger.error(f"❌ Failed to generate output file: {output_path}")
-                            result['success'] = False
-                            result['error'] = "Failed to generate standardized file"
-
-                    results.append(result)
-
-                    # Clean up input file
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
+                    file_path, digest = _save_upload(file.stream, filename, app.config['UPLOAD_FOLDER'])
+                    saved_files.append((index, file.filename, filename, file_path, digest))
 
                 except Exception as e:
-                    logger.error(f"Error processing file {file.filename}: {str(e)}")
-                    results.append({
+                    logger.error(f"Error saving file {file.filename}: {str(e)}")
+                    results[index] = {
                         'success': False,
                         'error': str(e),
                         'file_name': file.filename
-                    })
+                    }
             else:
-                results.append({
+                results[index] = {
                     'success': False,
                     'error': 'Invalid file format',
                     'file_name': file.filename if file else 'Unknown'
-                })
+                }
 
-        return jsonify({
-            'success': True,
-            'results': results,
-            'total_processed': len([r for r in results if r['success']]),
-            'total_failed': len([r for r in results if not r['success']])
-        })
+        return _dispatch_transform(results, saved_files, options)
 
     except Exception as e:
         logger.error(f"Transformation API error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/preview/<filename>')
-def preview_file(filename):
-    """Preview processed file"""
+@app.route('/api/transform_stream', methods=['POST'])
+def transform_statement_stream():
+    """API endpoint to transform a single statement sent as the raw request body"""
     try:
-        # Clean the filename for security
-        filename = secure_filename(filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        if _upload_exceeds_limit():
+            return _too_large_response()
 
-        logger.info(f"Preview request for: {filename}")
+        original_name = unquote(request.headers.get('X-Filename', ''))
+        if not original_name:
+            return jsonify({'success': False, 'error': 'No filename provided'})
 
-        if not os.path.exists(file_path):
-            return jsonify({'success': False, 'error': 'File not found'}), 404
+        if request.mimetype != 'application/octet-stream':
+            return jsonify({'success': False, 'error': 'Expected an application/octet-stream body'}), 415
 
-        # Read the Excel file
-        try:
-            # Read both sheets if they exist
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+        options = _transform_options(request.args)
+        results = [None]
+        saved_files = []
+
+        filename = secure_filename(original_name)
+        if allowed_file(filename):
+            # Stream the body straight to disk without multipart parsing
+            file_path, digest = _save_upload(request.stream, filename, app.config['UPLOAD_FOLDER'])
+            saved_files.append((0, original_name, filename, file_path, digest))
+        else:
+            results[0] = {
+                'success': False,
+                'error': 'Invalid file format',
+                'file_name': original_name
+            }
+
+        return _dispatch_transform(results, saved_files, options)
+
+    except Exception as e:
+        logger.error(f"Stream transformation API error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/job/<job_id>')
+def job_status(job_id):
+    """Report the state of a background transform job"""
+    try:
+        job = transform_task.AsyncResult(job_id)
+        response = {'success': True, 'job_id': job_id, 'state': job.state}
+
+        if job.successful():
+            response['result'] = job.result
+            for result in response['result']['results']:
+                if result.get('output_file') and 'transactions' not in result:
+                    output_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(result['output_file']))
+                    try:
+                        result['transactions'] = _read_transactions(output_path)
+                    except FileNotFoundError:
+                        # Expired by the janitor since the job finished
+                        result['transactions'] = []
+                        result['download_ready'] = False
+        elif job.failed():
+            response['error'] = str(job.result)
+
+        return jsonify(response)
+
+    except Exception as e:
+        logger.error(f"Job status error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _sidecar_path(file_path, kind):
+    """Path of a JSON sidecar ('preview' or 'meta') stored next to an output file"""
+    return f"{file_path}.{kind}.json"
+
+
+def _parquet_path(file_path):
+    """Path of the parquet copy of the transactions written next to an output file"""
+    return f"{file_path}.parquet"
+
+
+def _read_transactions(output_path):
+    """Transactions of a standardized file, read back from its parquet copy"""
+    return pd.read_parquet(_parquet_path(output_path)).fillna('').to_dict('records')
+
+
+def _companion_paths(file_path):
+    """Parquet copy and JSON sidecars stored next to an output file"""
+    return _parquet_path(file_path), _sidecar_path(file_path, 'meta'), _sidecar_path(file_path, 'preview')
+
+
+def _write_metadata_sidecar(result, output_path, options):
+    """Persist the transform metadata (and the options used) next to a freshly generated file"""
+    metadata = {
+        **result['metadata'],
+        'account_info': result['account_info'],
+        'original_format': result['original_format'],
+        'records_processed': result['records_processed'],
+        'options': options
+    }
+
+    with open(_sidecar_path(output_path, 'meta'), 'w') as f:
+        json.dump(metadata, f, default=str)
+
+
+def _preview_account_info(account_info):
+    """Account fields shown in the preview modal"""
+    return {
+        key: str(account_info[key])
+        for key in ('account_number', 'account_name')
+        if key in account_info
+    }
+
+
+def _preview_records(df):
+    """Convert preview rows to JSON records, replacing missing values with empty strings"""
+    return df.astype('string[pyarrow]').fillna('').to_dict('records')
+
+
+def _write_preview_sidecar(result, output_path):
+    """Persist the preview payload next to a freshly generated file"""
+    data = _preview_records(pd.DataFrame(result['transactions'][:PREVIEW_ROWS]))
+    date_range_start = result['metadata'].get('date_range_start')
+    date_range_end = result['metadata'].get('date_range_end')
+
+    preview = {
+        'success': True,
+        'headers': result['metadata']['standard_headers'],
+        'data': data,
+        'total_records': result['records_processed'],
+        'preview_records': len(data),
+        'account_info': _preview_account_info(result['account_info']),
+        'format': result['original_format'],
+        'date_range': f"{date_range_start} to {date_range_end}" if date_range_start else "N/A"
+    }
 
-            # Read the transactions sheet
-            if 'Transactions' in sheet_names:
-                df = pd.read_excel(file_path, sheet_name='Transactions')
+    with open(_sidecar_path(output_path, 'preview'), 'w') as f:
+        json.dump(preview, f)
+
+
+@lru_cache(maxsize=128)
+def _build_preview(file_path, mtime):
+    """Build the preview payload for a standardized file.
+
+    Results are cached per (path, mtime) since standardized files are never
+    modified after they are written.
+    """
+    preview_path = _sidecar_path(file_path, 'preview')
+    if os.path.exists(preview_path):
+        with open(preview_path) as f:
+            return json.load(f)
+
+    # Prefer the parquet copy: it reads faster than xlsx and stores its row count in the footer
+    transactions_sheet = 'Transactions'
+    total_records = None
+    workbook = None  # The xlsx is opened at most once, and only when it has to be read
+    parquet_path = _parquet_path(file_path)
+    try:
+        if os.path.exists(parquet_path):
+            parquet_file = pq.ParquetFile(parquet_path)
+            total_records = parquet_file.metadata.num_rows
+            first_rows = next(parquet_file.iter_batches(batch_size=PREVIEW_ROWS), None)
+            if first_rows is None:
+                df = parquet_file.schema_arrow.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
             else:
-                df = pd.read_excel(file_path, sheet_name=0)  # First sheet
+                df = first_rows.to_pandas(types_mapper=pd.ArrowDtype)
 
-            # Read metadata if available
-            account_info = {}
-            format_info = "Standardized"
+        else:
+            # Our writer always produces a Transactions sheet; older files fall back to the first sheet
+            # Arrow-backed columns keep the preview in flat buffers instead of boxed str objects
+            workbook = pd.ExcelFile(file_path, engine=PREVIEW_ENGINE)
+            if transactions_sheet not in workbook.sheet_names:
+                transactions_sheet = 0
+            df = workbook.parse(transactions_sheet, nrows=PREVIEW_ROWS, dtype_backend='pyarrow')
+
+        # Read metadata if available, preferring the JSON sidecar over the Metadata sheet
+        account_info = {}
+        format_info = "Standardized"
+        date_range_start = date_range_end = ''
+
+        metadata_path = _sidecar_path(file_path, 'meta')
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+
+            account_info = _preview_account_info(metadata['account_info'])
+            format_info = metadata['original_format']
+            total_records = metadata['records_processed']
+            date_range_start = metadata.get('date_range_start', '')
+            date_range_end = metadata.get('date_range_end', '')
 
-            if 'Metadata' in sheet_names:
-                try:
-                    metadata_df = pd.read_excel(file_path, sheet_name='Metadata')
+        else:
+            if workbook is None:
+                workbook = pd.ExcelFile(file_path, engine=PREVIEW_ENGINE)
+
+            try:
+                if 'Metadata' in workbook.sheet_names:
+                    metadata_df = workbook.parse('Metadata')
                     for _, row in metadata_df.iterrows():
                         field = str(row.iloc[0]).strip()
-                        value = str(row.iloc[1]).strip() if len(row) > 1 else ''
+                        value = row.iloc[1] if len(row) > 1 else ''
+                        value = '' if pd.isna(value) else str(value).strip()
 
                         if 'Account Number' in field:
                             account_info['account_number'] = value
@@ -681,47 +621,56 @@ def preview_file(filename):
                             account_info['account_name'] = value
                         elif 'Original Format' in field:
                             format_info = value
-                except Exception as e:
-                    logger.warning(f"Could not read metadata: {e}")
-
-            # Get preview data (first 20 rows)
-            preview_rows = min(20, len(df))
-            preview_df = df.head(preview_rows)
-
-            # Convert to records for JSON
-            headers = list(df.columns)
-            data = preview_df.to_dict('records')
-
-            # Clean the data (replace NaN with empty strings)
-            for row in data:
-                for key in row:
-                    if pd.isna(row[key]):
-                        row[key] = ''
-                    else:
-                        row[key] = str(row[key])
-
-            # Try to determine date range
-            date_range = "N/A"
-            try:
-                if 'Tran Date' in df.columns:
-                    dates = pd.to_datetime(df['Tran Date'], errors='coerce').dropna()
-                    if len(dates) > 0:
-                        min_date = dates.min().strftime('%d/%m/%Y')
-                        max_date = dates.max().strftime('%d/%m/%Y')
-                        date_range = f"{min_date} to {max_date}"
+                        elif 'Records Processed' in field and value:
+                            total_records = int(float(value))
+                        elif 'Date Range Start' in field:
+                            date_range_start = value
+                        elif 'Date Range End' in field:
+                            date_range_end = value
             except Exception as e:
-                logger.warning(f"Could not determine date range: {e}")
+                logger.warning(f"Could not read metadata: {e}")
 
-            return jsonify({
-                'success': True,
-                'headers': headers,
-                'data': data,
-                'total_records': len(df),
-                'preview_records': preview_rows,
-                'account_info': account_info,
-                'format': format_info,
-                'date_range': date_range
-            })
+        # Older files (or files without metadata) need a row count; only reached
+        # without a parquet copy, so the workbook is already open
+        if total_records is None:
+            total_records = len(workbook.parse(transactions_sheet, usecols=[0]))
+
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+    # Convert preview rows to records for JSON
+    headers = list(df.columns)
+    data = _preview_records(df)
+
+    return {
+        'success': True,
+        'headers': headers,
+        'data': data,
+        'total_records': total_records,
+        'preview_records': len(df),
+        'account_info': account_info,
+        'format': format_info,
+        'date_range': f"{date_range_start} to {date_range_end}" if date_range_start else "N/A"
+    }
+
+
+@app.route('/api/preview/<filename>')
+def preview_file(filename):
+    """Preview processed file"""
+    try:
+        # Clean the filename for security
+        filename = secure_filename(filename)
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+        logger.info(f"Preview request for: {filename}")
+
+        if not os.path.exists(file_path):
+            return jsonify({'success': False, 'error': 'File not found'}), 404
+
+        # Read the Excel file
+        try:
+            return jsonify(_build_preview(file_path, os.path.getmtime(file_path)))
 
         except Exception as e:
             logger.error(f"Error reading Excel file: {e}")
@@ -732,6 +681,22 @@ def preview_file(filename):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _list_upload_folder(limit=MAX_LISTED_FILES):
+    """Return up to `limit` file names from the upload folder and the total file count"""
+    names = []
+    total = 0
+
+    if os.path.exists(app.config['UPLOAD_FOLDER']):
+        with os.scandir(app.config['UPLOAD_FOLDER']) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    total += 1
+                    if len(names) < limit:
+                        names.append(entry.name)
+
+    return names, total
+
+
 @app.route('/api/download/<filename>')
 def download_file(filename):
     """Download processed file"""
@@ -740,23 +705,31 @@ def download_file(filename):
         filename = secure_filename(filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
 
+        download_name = secure_filename(request.args.get('name', '')) or filename
+
         logger.info(f"Download request for: {filename}")
         logger.info(f"Full path: {file_path}")
         logger.info(f"File exists: {os.path.exists(file_path)}")
 
         if os.path.exists(file_path):
+            if app.config['X_ACCEL_REDIRECT_PREFIX']:
+                logger.info(f"✅ Delegating file to nginx: {file_path}")
+                response = Response(mimetype=XLSX_MIMETYPE)
+                response.headers['X-Accel-Redirect'] = f"{app.config['X_ACCEL_REDIRECT_PREFIX'].rstrip('/')}/{filename}"
+                response.headers['Content-Disposition'] = f'attachment; filename={download_name}'
+                return response
+
+            # send_file emits X-Sendfile itself when USE_X_SENDFILE is enabled
             logger.info(f"✅ Sending file: {file_path}")
             return send_file(
                 file_path,
                 as_attachment=True,
-                download_name=filename,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                download_name=download_name,
+                mimetype=XLSX_MIMETYPE
             )
         else:
             # List available files for debugging
-            available_files = []
-            if os.path.exists(app.config['UPLOAD_FOLDER']):
-                available_files = os.listdir(app.config['UPLOAD_FOLDER'])
+            available_files, _ = _list_upload_folder()
 
             logger.error(f"❌ File not found. Requested: {filename}")
             logger.error(f"Available files in {app.config['UPLOAD_FOLDER']}: {available_files}")
@@ -790,21 +763,77 @@ def debug_info():
     """Debug endpoint to check file system"""
     try:
         upload_folder = app.config['UPLOAD_FOLDER']
-        files_in_folder = []
-
-        if os.path.exists(upload_folder):
-            files_in_folder = os.listdir(upload_folder)
+        files_in_folder, total_files = _list_upload_folder()
 
         return jsonify({
             'upload_folder': upload_folder,
             'folder_exists': os.path.exists(upload_folder),
             'files_in_folder': files_in_folder,
-            'total_files': len(files_in_folder)
+            'total_files': total_files
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _expire_uploads(upload_folder, ttl=UPLOAD_TTL_SECONDS):
+    """Delete files older than ttl seconds from the upload folder (skipping .lock files)"""
+    cutoff = time.time() - ttl
+    with os.scandir(upload_folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.endswith('.lock'):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    logger.info(f"🧹 Removed expired file: {entry.name}")
+            except FileNotFoundError:
+                pass
+
+
+def _acquire_janitor_lock(upload_folder):
+    """Take the upload folder's janitor lock without blocking.
+
+    Returns the open lock file (held until it is closed or the process exits),
+    or None when another process holds it.
+    """
+    lock_file = open(os.path.join(upload_folder, JANITOR_LOCK_NAME), 'a')
+    if fcntl is None:
+        return lock_file  # No flock on this platform; every janitor runs
+
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _janitor(ttl=UPLOAD_TTL_SECONDS, interval=JANITOR_INTERVAL):
+    """Periodically delete expired files from the upload folder.
+
+    Every gunicorn worker starts a janitor, but only the one holding the janitor
+    lock cleans; the others keep retrying the lock in case its holder exits.
+    """
+    lock_file = None
+    while True:
+        try:
+            if lock_file is None:
+                lock_file = _acquire_janitor_lock(app.config['UPLOAD_FOLDER'])
+            if lock_file is not None:
+                _expire_uploads(app.config['UPLOAD_FOLDER'], ttl)
+        except Exception as e:
+            logger.warning(f"Upload folder cleanup failed: {e}")
+
+        time.sleep(interval)
+
+
+def _start_janitor():
+    """Start the upload folder janitor in a daemon thread"""
+    thread = threading.Thread(target=_janitor, name='upload-janitor', daemon=True)
+    thread.start()
+    return thread
+
+
 if __name__ == '__main__':
     print("🚀 Starting Nigerian Bank Statement Transformer...")
     print("📊 Supported formats: XLSX, XLS, ODS")
@@ -817,7 +846,10 @@ if __name__ == '__main__':
     # Ensure upload folder exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-    # Run the application
+    # Expire old uploads and standardized files in the background
+    _start_janitor()
+
+    # Development server only; in production run: gunicorn -c gunicorn_conf.py app:app
     app.run(
         host='0.0.0.0',
         port=5000,
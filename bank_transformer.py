@@ -3,30 +3,218 @@ Nigerian Bank Statement Standardization Engine - Python Implementation
 Designed for M4 MacBook with PyCharm
 """
 
+import os
 import pandas as pd
+import numpy as np
 import openpyxl
+import xlsxwriter
 from pathlib import Path
 import re
-from datetime import datetime
+from functools import cached_property
+from itertools import groupby, repeat
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 import json
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Excel engine used to read statements (calamine is much faster than openpyxl)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Stop reading a sheet after this many consecutive empty rows (trailing blank regions)
+MAX_CONSECUTIVE_EMPTY_ROWS = 50
+
+# Worksheet limits of the xlsx format (rows include the header row)
+MAX_EXCEL_ROWS = 1048576
+MAX_EXCEL_CELL_CHARS = 32767
+
+
+class _RawRows(list):
+    """Raw sheet rows plus a lazily built column-wise (object DataFrame) view.
+
+    The view lives on the rows rather than on the transformer, which is shared
+    between request threads.
+    """
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self, dtype=object)  # Ragged rows are padded with None
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _parse_amounts_jit(buffer, offsets):
+        """Parse plain amounts like '₦1,234.56' from concatenated UTF-8 bytes.
+
+        Amount i is buffer[offsets[i]:offsets[i + 1]]. Currency symbols, commas,
+        brackets and ASCII whitespace are skipped. Anything else (exponents, other
+        characters, more than 15 significant digits) gives NaN so the caller can
+        fall back to float(); otherwise the result matches float() exactly.
+        """
+        amounts = np.empty(len(offsets) - 1)
+
+        for i in range(len(offsets) - 1):
+            end = offsets[i + 1]
+            pos = offsets[i]
+            mantissa = 0
+            digits = 0
+            decimals = 0
+            seen_point = False
+            seen_sign = False
+            negative = False
+            valid = True
+
+            while pos < end:
+                byte = buffer[pos]
+                pos += 1
+                if 48 <= byte <= 57:  # 0-9
+                    mantissa = mantissa * 10 + (byte - 48)
+                    digits += 1
+                    if seen_point:
+                        decimals += 1
+                elif byte == 46:  # .
+                    if seen_point:
+                        valid = False
+                        break
+                    seen_point = True
+                elif byte == 45 or byte == 43:  # - or +
+                    if seen_sign or seen_point or digits:
+                        valid = False
+                        break
+                    seen_sign = True
+                    negative = byte == 45
+                elif byte == 36 or byte == 44 or byte == 40 or byte == 41 or byte == 32 or 9 <= byte <= 13:
+                    continue  # $ , ( ) and whitespace
+                elif byte == 0xC2 and pos < end and buffer[pos] == 0xA3:
+                    pos += 1  # £
+                elif (byte == 0xE2 and pos + 1 < end and buffer[pos] == 0x82
+                      and (buffer[pos + 1] == 0xA6 or buffer[pos + 1] == 0xAC)):
+                    pos += 2  # ₦ or €
+                else:
+                    valid = False
+                    break
+
+            if not valid or digits == 0 or digits > 15:
+                amounts[i] = np.nan
+                continue
+
+            # Both operands are exact doubles, so the division is correctly rounded
+            amount = mantissa / 10.0 ** decimals
+            amounts[i] = -amount if negative else amount
+
+        return amounts
+
+
+def _build_bank_formats() -> Dict:
+    """Known bank statement layouts, keyed by format"""
+    formats = {
+        'FCMB_FORMAT_1': {
+            'name': 'FCMB Statement Format 1',
+            'identifiers': ['1021040520', 'STATEMENT OF ACCOUNT'],
+            'header_row': 16,
+            'account_info_rows': [3, 4, 5, 6, 7, 8, 12, 13, 14],
+            'mapping': {
+                'Transaction Date': 'Tran Date',
+                'Description': 'Transaction Details',
+                'Value Date': 'Value Date',
+                'Withdrawls': 'Debit',
+                'Deposits': 'Credit',
+                'Balance': 'Balance',
+                'Instrument Code': 'Ref. No'
+            }
+        },
+        'GTB_ODS_FORMAT': {
+            'name': 'GTB ODS Statement Format',
+            'identifiers': ['TRA DATE', 'REMARKS', 'NUBAN'],
+            'header_row': 2,
+            'account_info_rows': [0, 1],
+            'mapping': {
+                'TRA DATE': 'Tran Date',
+                'REMARKS': 'Transaction Details',
+                'NUBAN': 'Ref. No',
+                'DEBIT': 'Debit',
+                'CREDIT': 'Credit',
+                'CRNT BAL': 'Balance'
+            }
+        },
+        'GENERIC': {
+            'name': 'Generic Bank Format',
+            'identifiers': [],
+            'header_row': 'auto-detect',
+            'mapping': {}
+        }
+    }
+
+    # Lowercase the identifiers once instead of on every detection
+    for format_info in formats.values():
+        format_info['identifiers_lower'] = tuple(identifier.lower() for identifier in format_info['identifiers'])
+
+    return formats
+
+
+def _build_identifier_automaton(bank_formats: Dict):
+    """Build an Aho-Corasick automaton over all format identifiers (None without pyahocorasick)"""
+    identifiers = {
+        identifier
+        for format_info in bank_formats.values()
+        for identifier in format_info['identifiers_lower']
+    }
+    if not AHOCORASICK_AVAILABLE or not identifiers:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for identifier in identifiers:
+        automaton.add_word(identifier, identifier)
+    automaton.make_automaton()
+    return automaton
+
 
 class BankStatementTransformer:
-    def __init__(self):
-        self.standard_headers = [
-            'Tran Date', 'Value Date', 'Ref. No', 'Transaction Details',
-            'Debit', 'Credit', 'Balance'
-        ]
-
-        self.bank_formats = self._initialize_bank_formats()
-        self.date_patterns = [
-            r'^\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4}$',  # DD/MM/YYYY or DD-MM-YYYY
-            r'^\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2}$',  # YYYY/MM/DD or YYYY-MM-DD
-            r'^\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2}$'  # DD/MM/YY or DD-MM-YY
-        ]
+    # Format definitions and compiled patterns are built once at import and shared
+    # (read-only) by every instance
+    standard_headers = [
+        'Tran Date', 'Value Date', 'Ref. No', 'Transaction Details',
+        'Debit', 'Credit', 'Balance'
+    ]
+
+    bank_formats = _build_bank_formats()
+    _identifier_automaton = _build_identifier_automaton(bank_formats)
+    date_formats = {
+        'DD/MM/YYYY': '%d/%m/%Y',
+        'MM/DD/YYYY': '%m/%d/%Y',
+        'YYYY-MM-DD': '%Y-%m-%d'
+    }
+
+    # Compile the patterns used on every cell once
+    _date_re = re.compile(
+        r'^(?:\d{1,2}[\/\-]\d{1,2}[\/\-](?:\d{4}|\d{2})'  # DD/MM/YYYY, DD-MM-YYYY, DD/MM/YY or DD-MM-YY
+        r'|\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2})$'  # YYYY/MM/DD or YYYY-MM-DD
+    )
+    _year_first_re = re.compile(r'^\s*\d{4}[\/\-]')  # YYYY/MM/DD or YYYY-MM-DD
+    _amount_clean_re = re.compile(r'[₦$£€,\s()]')
+    _name_re = re.compile(r'\b[A-Z][A-Z\s]{10,}\b')  # Uppercase letters and spaces
+    _common_headers_re = re.compile('|'.join(map(re.escape, [
+        'date', 'transaction', 'description', 'narration', 'remarks',
+        'debit', 'credit', 'withdrawal', 'deposit', 'balance', 'amount'
+    ])))  # Financial header keywords, for generic format detection
 
+    def __init__(self):
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
@@ -34,45 +222,6 @@ class BankStatementTransformer:
         )
         self.logger = logging.getLogger(__name__)
 
-    def _initialize_bank_formats(self) -> Dict:
-        return {
-            'FCMB_FORMAT_1': {
-                'name': 'FCMB Statement Format 1',
-                'identifiers': ['1021040520', 'STATEMENT OF ACCOUNT'],
-                'header_row': 16,
-                'account_info_rows': [3, 4, 5, 6, 7, 8, 12, 13, 14],
-                'mapping': {
-                    'Transaction Date': 'Tran Date',
-                    'Description': 'Transaction Details',
-                    'Value Date': 'Value Date',
-                    'Withdrawls': 'Debit',
-                    'Deposits': 'Credit',
-                    'Balance': 'Balance',
-                    'Instrument Code': 'Ref. No'
-                }
-            },
-            'GTB_ODS_FORMAT': {
-                'name': 'GTB ODS Statement Format',
-                'identifiers': ['TRA DATE', 'REMARKS', 'NUBAN'],
-                'header_row': 2,
-                'account_info_rows': [0, 1],
-                'mapping': {
-                    'TRA DATE': 'Tran Date',
-                    'REMARKS': 'Transaction Details',
-                    'NUBAN': 'Ref. No',
-                    'DEBIT': 'Debit',
-                    'CREDIT': 'Credit',
-                    'CRNT BAL': 'Balance'
-                }
-            },
-            'GENERIC': {
-                'name': 'Generic Bank Format',
-                'identifiers': [],
-                'header_row': 'auto-detect',
-                'mapping': {}
-            }
-        }
-
     def transform_statement(self, file_path: str, options: Dict = None) -> Dict:
         """Main transformation function"""
         if options is None:
@@ -82,7 +231,7 @@ class BankStatementTransformer:
             self.logger.info(f"Processing file: {file_path}")
 
             # Read the file
-            df, raw_data = self._read_file(file_path)
+            raw_data = self._read_file(file_path)
 
             # Detect format
             format_info = self._detect_format(raw_data, file_path)
@@ -92,7 +241,7 @@ class BankStatementTransformer:
 
             # Extract and standardize transactions
             transactions = self._extract_transactions(raw_data, format_info)
-            standardized_transactions = self._standardize_transactions(
+            standardized_transactions, (date_range_start, date_range_end) = self._standardize_transactions(
                 transactions, format_info, options
             )
 
@@ -105,7 +254,9 @@ class BankStatementTransformer:
                 'metadata': {
                     'file_name': Path(file_path).name,
                     'processed_at': datetime.now().isoformat(),
-                    'standard_headers': self.standard_headers
+                    'standard_headers': list(self.standard_headers),  # Callers may edit their copy
+                    'date_range_start': date_range_start,
+                    'date_range_end': date_range_end
                 }
             }
 
@@ -120,32 +271,101 @@ class BankStatementTransformer:
                 'file_name': Path(file_path).name
             }
 
-    def _read_file(self, file_path: str) -> Tuple[pd.DataFrame, List[List]]:
-        """Read file and return both DataFrame and raw data"""
-        file_path = Path(file_path)
+    def transform_statements_batch(self, file_paths: List[str], options: Dict = None,
+                                   max_workers: Optional[int] = None) -> List[Dict]:
+        """Transform several statements in parallel worker processes.
+
+        Parsing is CPU-bound and holds the GIL, so each file runs in its own
+        process with its own transformer. Results are in the order of file_paths.
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) < 2:
+            return [self.transform_statement(file_path, options) for file_path in file_paths]
 
-        if file_path.suffix.lower() in ['.xlsx', '.xls']:
-            # Read with openpyxl to preserve formatting
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
-            worksheet = workbook.active
+        max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_worker_transform, file_paths, repeat(options)))
 
-            # Convert to list of lists (raw data)
-            raw_data = []
-            for row in worksheet.iter_rows(values_only=True):
-                raw_data.append(list(row))
+    def _read_file(self, file_path: str) -> List[List]:
+        """Read the active sheet of a file into raw rows (sequences of cell values)"""
+        file_path = Path(file_path)
+        suffix = file_path.suffix.lower()
+
+        if suffix in ['.xlsx', '.xls'] and EXCEL_ENGINE == 'calamine':
+            # Blank cells come back as '' (not NaN) so text such as 'N/A' survives; store them as None
+            frame = pd.read_excel(file_path, sheet_name=self._active_sheet_name(file_path), engine='calamine',
+                                  header=None, dtype=object, keep_default_na=False)
+            frame = self._drop_after_empty_run(frame.where(frame != '', None))
 
-            # Also create DataFrame
-            df = pd.read_excel(file_path, header=None)
+            raw_data = _RawRows(frame.values.tolist())
+            raw_data.frame = frame  # Already the column-wise view
+            return raw_data
 
-        elif file_path.suffix.lower() == '.ods':
+        if suffix == '.xlsx':
+            # Stream the sheet once; read-only mode skips styles and the full cell DOM
+            workbook = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
+            try:
+                worksheet = workbook.active
+                raw_data = []
+                consecutive_empty = 0
+                # Rows are only ever read, so keep the value tuples openpyxl yields
+                # (smaller than lists and no per-row copy)
+                for row in worksheet.values:
+                    if any(cell is not None for cell in row):
+                        consecutive_empty = 0
+                    else:
+                        consecutive_empty += 1
+                        if consecutive_empty >= MAX_CONSECUTIVE_EMPTY_ROWS:
+                            break
+                    raw_data.append(row)
+            finally:
+                workbook.close()
+
+        elif suffix == '.xls':
+            # openpyxl cannot read the legacy binary format, so use pandas (xlrd)
+            raw_data = pd.read_excel(file_path, header=None).values.tolist()
+
+        elif suffix == '.ods':
             # For ODS files, use pandas
-            df = pd.read_excel(file_path, engine='odf', header=None)
-            raw_data = df.values.tolist()
+            raw_data = pd.read_excel(file_path, engine='odf', header=None).values.tolist()
 
         else:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
 
-        return df, raw_data
+        return _RawRows(raw_data)
+
+    @staticmethod
+    def _active_sheet_name(file_path: Path):
+        """Sheet to read: the active sheet of an xlsx workbook, the first sheet otherwise"""
+        if file_path.suffix.lower() != '.xlsx':
+            return 0  # Legacy .xls was always read from the first sheet
+
+        # A read-only open parses the workbook part, not the sheets
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return workbook.active.title
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _drop_after_empty_run(frame: pd.DataFrame) -> pd.DataFrame:
+        """Drop the rows from the MAX_CONSECUTIVE_EMPTY_ROWS-th consecutive empty row onwards"""
+        empty = frame.isna().all(axis=1).to_numpy()
+        if len(empty) < MAX_CONSECUTIVE_EMPTY_ROWS:
+            return frame
+
+        runs = np.lib.stride_tricks.sliding_window_view(empty, MAX_CONSECUTIVE_EMPTY_ROWS).all(axis=1)
+        if not runs.any():
+            return frame
+
+        return frame.iloc[:int(runs.argmax()) + MAX_CONSECUTIVE_EMPTY_ROWS - 1]
+
+    @staticmethod
+    def _raw_frame(raw_data: List[List]) -> pd.DataFrame:
+        """Column-wise view of raw rows (cached for rows returned by _read_file)"""
+        if isinstance(raw_data, _RawRows):
+            return raw_data.frame
+        return pd.DataFrame(raw_data, dtype=object)
 
     def _detect_format(self, raw_data: List[List], file_path: str) -> Dict:
         """Detect bank format based on content analysis"""
@@ -156,15 +376,21 @@ class BankStatementTransformer:
             for cell in row if cell is not None
         ]).lower()
 
+        # Find every identifier in one pass over the text when pyahocorasick is available
+        if self._identifier_automaton is not None:
+            found = {identifier for _, identifier in self._identifier_automaton.iter(search_text)}
+        else:
+            found = None
+
         # Check each format's identifiers
         for format_key, format_info in self.bank_formats.items():
             if format_key == 'GENERIC':
                 continue
 
-            identifiers_found = all(
-                identifier.lower() in search_text
-                for identifier in format_info['identifiers']
-            )
+            if found is not None:
+                identifiers_found = all(identifier in found for identifier in format_info['identifiers_lower'])
+            else:
+                identifiers_found = all(identifier in search_text for identifier in format_info['identifiers_lower'])
 
             if identifiers_found:
                 self.logger.info(f"Detected format: {format_info['name']}")
@@ -176,45 +402,39 @@ class BankStatementTransformer:
 
     def _detect_generic_format(self, raw_data: List[List]) -> Dict:
         """Generic format detection for unknown banks"""
-        common_headers = [
-            'date', 'transaction', 'description', 'narration', 'remarks',
-            'debit', 'credit', 'withdrawal', 'deposit', 'balance', 'amount'
-        ]
-
         header_row = -1
         mapping = {}
 
-        # Search for header row
-        for i, row in enumerate(raw_data[:25]):
-            if not row:
-                continue
-
-            header_count = sum(1 for cell in row if cell and isinstance(cell, str) and
-                               any(header in str(cell).lower() for header in common_headers))
-
-            if header_count >= 4:  # At least 4 financial headers found
-                header_row = i
-
-                # Create mapping
-                for j, cell in enumerate(row):
-                    if cell and isinstance(cell, str):
-                        cell_lower = str(cell).lower()
-
-                        if 'date' in cell_lower and 'value' not in cell_lower:
-                            mapping[cell] = 'Tran Date'
-                        elif 'value' in cell_lower and 'date' in cell_lower:
-                            mapping[cell] = 'Value Date'
-                        elif any(word in cell_lower for word in ['description', 'narration', 'remarks']):
-                            mapping[cell] = 'Transaction Details'
-                        elif any(word in cell_lower for word in ['debit', 'withdrawal']):
-                            mapping[cell] = 'Debit'
-                        elif any(word in cell_lower for word in ['credit', 'deposit']):
-                            mapping[cell] = 'Credit'
-                        elif 'balance' in cell_lower:
-                            mapping[cell] = 'Balance'
-                        elif any(word in cell_lower for word in ['reference', 'ref']):
-                            mapping[cell] = 'Ref. No'
-                break
+        # Search for header row: count the text cells in each of the first
+        # 25 rows that mention a financial header, column by column
+        head = self._raw_frame(raw_data).head(25)
+        texts = head.where(head.map(lambda cell: isinstance(cell, str))).astype('string')
+        mentions = texts.apply(lambda column: column.str.lower().str.contains(self._common_headers_re)).fillna(False)
+        header_count = mentions.sum(axis=1)
+
+        header_rows = header_count.index[header_count >= 4]  # At least 4 financial headers found
+        if len(header_rows):
+            header_row = int(header_rows[0])
+
+            # Create mapping
+            for j, cell in enumerate(raw_data[header_row]):
+                if cell and isinstance(cell, str):
+                    cell_lower = str(cell).lower()
+
+                    if 'date' in cell_lower and 'value' not in cell_lower:
+                        mapping[cell] = 'Tran Date'
+                    elif 'value' in cell_lower and 'date' in cell_lower:
+                        mapping[cell] = 'Value Date'
+                    elif any(word in cell_lower for word in ['description', 'narration', 'remarks']):
+                        mapping[cell] = 'Transaction Details'
+                    elif any(word in cell_lower for word in ['debit', 'withdrawal']):
+                        mapping[cell] = 'Debit'
+                    elif any(word in cell_lower for word in ['credit', 'deposit']):
+                        mapping[cell] = 'Credit'
+                    elif 'balance' in cell_lower:
+                        mapping[cell] = 'Balance'
+                    elif any(word in cell_lower for word in ['reference', 'ref']):
+                        mapping[cell] = 'Ref. No'
 
         return {
             'key': 'GENERIC',
@@ -235,13 +455,12 @@ class BankStatementTransformer:
                     row_text = ' '.join(str(cell) for cell in row if cell is not None)
 
                     # Extract account number (10+ digits)
-                    account_match = re.search(r'(\d{10,})', row_text)
-                    if account_match and 'account_number' not in account_info:
-                        account_info['account_number'] = account_match.group(1)
+                    account_number = self._find_long_digit_run(row_text)
+                    if account_number and 'account_number' not in account_info:
+                        account_info['account_number'] = account_number
 
                     # Extract account name (uppercase letters and spaces)
-                    name_pattern = r'\b[A-Z][A-Z\s]{10,}\b'
-                    name_match = re.search(name_pattern, row_text)
+                    name_match = self._name_re.search(row_text)
                     if name_match and 'account_name' not in account_info:
                         potential_name = name_match.group(0).strip()
                         if 'ACCOUNT' not in potential_name:
@@ -257,119 +476,277 @@ class BankStatementTransformer:
 
         return account_info
 
-    def _extract_transactions(self, raw_data: List[List], format_info: Dict) -> List[Dict]:
-        """Extract transaction data from raw data"""
+    @staticmethod
+    def _find_long_digit_run(text: str, min_len: int = 10) -> Optional[str]:
+        """Return the first run of at least min_len consecutive digits in text, if any"""
+        # Digit runs never span whitespace, so check whole tokens first and only
+        # walk the characters of long tokens that mix digits with other text
+        for token in text.split():
+            if len(token) < min_len:
+                continue
+            if token.isdecimal():
+                return token
+            for is_digit, run in groupby(token, str.isdecimal):
+                if is_digit:
+                    digits = ''.join(run)
+                    if len(digits) >= min_len:
+                        return digits
+
+        return None
+
+    def _extract_transactions(self, raw_data: List[List], format_info: Dict) -> pd.DataFrame:
+        """Extract transaction rows from raw data.
+
+        Returns an object DataFrame with one column per (named) header instead of
+        a dict per transaction; cells that were empty in the sheet are None.
+        """
         if format_info['header_row'] == -1:
             raise ValueError('Unable to locate transaction header row')
 
         header_row_index = format_info['header_row']
         headers = raw_data[header_row_index]
-        transactions = []
-
-        for i in range(header_row_index + 1, len(raw_data)):
-            row = raw_data[i]
-            if not row or not any(cell for cell in row if cell is not None):
+        rows = raw_data[header_row_index + 1:]
+        if not rows:
+            return pd.DataFrame(dtype=object)
+
+        # Scan the rows column by column through the (None-padded) column-wise view
+        cells = self._raw_frame(raw_data).iloc[header_row_index + 1:].to_numpy()
+        width = cells.shape[1]
+
+        # Skip rows with no non-empty cell
+        has_value = np.frompyfunc(lambda cell: cell is not None and bool(cell), 1, 1)
+        non_empty = has_value(cells).astype(bool).any(axis=1)
+
+        # Check if each row looks like a transaction row (has a date or amount),
+        # only testing the next column for rows that have not matched yet
+        is_date_or_amount = np.frompyfunc(
+            lambda cell: cell is not None and (self._is_date(cell) or self._is_amount(cell)), 1, 1
+        )
+        is_transaction = np.zeros(len(rows), dtype=bool)
+        for j in range(width):
+            pending = np.flatnonzero(non_empty & ~is_transaction)
+            if not len(pending):
+                break
+            is_transaction[pending] = is_date_or_amount(cells[pending, j]).astype(bool)
+
+        selected = cells[is_transaction]
+        is_none = np.frompyfunc(lambda cell: cell is None, 1, 1)
+
+        # Columns under each header name; when a name repeats, later columns win
+        # wherever they have a value
+        columns = {}
+        for j, header in enumerate(headers):
+            if header and j < width:
+                column = selected[:, j]
+                name = str(header)
+                if name in columns:
+                    column = np.where(is_none(column).astype(bool), columns[name], column)
+                columns[name] = column
+
+        # Drop columns without any value, then rows without any value
+        columns = {name: column for name, column in columns.items()
+                   if not is_none(column).astype(bool).all()}
+        transactions = pd.DataFrame(columns, dtype=object)
+        if columns:
+            transactions = transactions[~is_none(transactions.to_numpy()).astype(bool).all(axis=1)]
+        return transactions.reset_index(drop=True)
+
+    def _standardize_transactions(self, transactions: pd.DataFrame, format_info: Dict,
+                                  options: Dict) -> Tuple[List[Dict], Tuple[str, str]]:
+        """Standardize transactions to unified format.
+
+        Columns are standardized with vectorized pandas operations. Also returns
+        the (first, last) transaction dates, taken from the dates parsed here so
+        they never need re-parsing.
+        """
+        target_format = options.get('date_format', 'DD/MM/YYYY')
+        if not len(transactions):
+            return [], ('', '')
+
+        frame = transactions
+        standardized = pd.DataFrame('', index=frame.index, columns=self.standard_headers, dtype=object)
+        tran_dates = []
+
+        # Apply mapping from format configuration (later columns win for the same standard header)
+        for original, standard in format_info['mapping'].items():
+            if original not in frame.columns:
                 continue
 
-            # Check if this looks like a transaction row
-            has_date_or_amount = any(
-                self._is_date(cell) or self._is_amount(cell)
-                for cell in row if cell is not None
+            column = frame[original]
+            values = column[column.notna()]
+
+            # Special processing based on column type
+            if 'Date' in standard:
+                values, parsed = self._standardize_date_column(values, target_format)
+                if standard == 'Tran Date':
+                    tran_dates.append(parsed)
+            elif standard in ['Debit', 'Credit', 'Balance']:
+                values = self._standardize_amount_column(values)
+
+            standardized.loc[values.index, standard] = values
+
+        # Split a single signed Amount column into Debit/Credit where neither is set
+        if 'Amount' in frame.columns:
+            pending = (frame['Amount'].notna() & (standardized['Debit'] == '')
+                       & (standardized['Credit'] == ''))
+            if pending.any():
+                amounts = self._parse_amount_column(frame.loc[pending, 'Amount'])
+                negative = amounts < 0
+                standardized.loc[pending, ['Debit', 'Credit']] = ''
+                standardized.loc[negative[negative].index, 'Debit'] = self._format_amounts(amounts[negative].abs())
+                standardized.loc[negative[~negative].index, 'Credit'] = self._format_amounts(amounts[~negative])
+
+        records = standardized.to_dict('records')
+
+        dates = pd.concat(tran_dates) if tran_dates else pd.Series(dtype='datetime64[ns]')
+        return records, self._date_range(dates, target_format)
+
+    def _standardize_date_column(self, values: pd.Series, target_format: str = 'DD/MM/YYYY') -> Tuple[pd.Series, pd.Series]:
+        """Standardize a column of date cells.
+
+        Returns the formatted dates (raw text for cells that are not dates) and
+        the parsed dates (missing where parsing failed).
+        """
+        try:
+            parsed = self._parse_date_column(values)
+
+            # Format each distinct date once (factorize gives NaT the code -1, i.e. the trailing None)
+            codes, uniques = pd.factorize(parsed)
+            labels = np.append(np.asarray(uniques.strftime(self.date_formats.get(target_format, '%d/%m/%Y')),
+                                          dtype=object), None)
+            formatted = pd.Series(labels[codes], index=values.index, dtype=object)
+        except (TypeError, ValueError, AttributeError, OverflowError):
+            # Mixed time zones, out-of-range dates and similar oddities: fall back to parsing cell by cell
+            parsed = values.map(self._parse_date)
+            formatted = pd.Series(
+                [self._format_date(date_obj, value, target_format) for date_obj, value in zip(parsed, values)],
+                index=values.index, dtype=object
+            )
+            return formatted, parsed
+
+        unparsed = parsed.isna()
+        formatted[unparsed] = values[unparsed].map(lambda value: str(value) if value else '')
+        return formatted, parsed
+
+    def _parse_date_column(self, values: pd.Series) -> pd.Series:
+        """Parse a column of date cells to datetime64 (NaT for cells that are not dates)"""
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        kinds = values.map(type)
+        is_str = kinds == str
+        is_number = kinds.isin([int, float])
+        is_datetime = values.map(lambda value: isinstance(value, datetime)).astype(bool)
+
+        # The cache parses each distinct string once; statements repeat dates a lot
+        strings = values[is_str]
+        if not strings.empty:
+            # Statements are day-first, except ISO-style dates that start with the year
+            year_first = strings.str.match(self._year_first_re).astype(bool)
+            parsed[year_first[year_first].index] = pd.to_datetime(
+                strings[year_first], format='mixed', errors='coerce', cache=True
+            )
+            parsed[year_first[~year_first].index] = pd.to_datetime(
+                strings[~year_first], format='mixed', dayfirst=True, errors='coerce', cache=True
             )
 
-            if has_date_or_amount:
-                transaction = {}
-                for j, header in enumerate(headers):
-                    if header and j < len(row) and row[j] is not None:
-                        transaction[str(header)] = row[j]
-
-                if transaction:  # Only add non-empty transactions
-                    transactions.append(transaction)
-
-        return transactions
-
-    def _standardize_transactions(self, transactions: List[Dict], format_info: Dict, options: Dict) -> List[Dict]:
-        """Standardize transactions to unified format"""
-        standardized = []
-
-        for transaction in transactions:
-            standard_transaction = {}
-
-            # Apply mapping from format configuration
-            for original, standard in format_info['mapping'].items():
-                if original in transaction and transaction[original] is not None:
-                    value = transaction[original]
-
-                    # Special processing based on column type
-                    if 'Date' in standard:
-                        value = self._standardize_date(value, options.get('date_format', 'DD/MM/YYYY'))
-                    elif standard in ['Debit', 'Credit', 'Balance']:
-                        value = self._standardize_amount(value)
-
-                    standard_transaction[standard] = value
-
-            # Ensure all standard columns exist
-            for header in self.standard_headers:
-                if header not in standard_transaction:
-                    standard_transaction[header] = ''
-
-            # Handle debit/credit logic
-            self._handle_debit_credit_logic(standard_transaction, transaction)
-
-            standardized.append(standard_transaction)
-
-        return standardized
-
-    def _handle_debit_credit_logic(self, standardized: Dict, original: Dict):
-        """Handle debit/credit logic for different formats"""
-        # If amounts are in a single column with +/- signs
-        if 'Amount' in original and not standardized.get('Debit') and not standardized.get('Credit'):
-            amount = self._parse_amount(original['Amount'])
-            if amount < 0:
-                standardized['Debit'] = f"{abs(amount):.2f}"
-                standardized['Credit'] = ''
-            else:
-                standardized['Credit'] = f"{amount:.2f}"
-                standardized['Debit'] = ''
-
-        # Ensure proper formatting
-        if standardized.get('Debit') and not standardized.get('Credit'):
-            standardized['Credit'] = ''
-        if standardized.get('Credit') and not standardized.get('Debit'):
-            standardized['Debit'] = ''
+        # Excel serial numbers: days since 1899-12-30 (which absorbs Excel's 1900 leap year bug)
+        numbers = values[is_number].astype(float)
+        serials = numbers[(numbers > 1000) & np.isfinite(numbers)]
+        if not serials.empty:
+            parsed[serials.index] = pd.to_datetime(serials, unit='D', origin='1899-12-30', errors='coerce')
+
+        datetimes = values[is_datetime]
+        if not datetimes.empty:
+            parsed[datetimes.index] = pd.to_datetime(datetimes, errors='coerce')
+
+        if not pd.api.types.is_datetime64_dtype(parsed):
+            raise TypeError('Dates could not be parsed as a single datetime64 column')
+
+        return parsed
+
+    def _standardize_amount_column(self, values: pd.Series) -> pd.Series:
+        """Standardize a column of amount cells to 2-decimal strings"""
+        formatted = self._format_amounts(self._parse_amount_column(values))
+        formatted[values.map(lambda value: isinstance(value, str)).astype(bool) & (values == '')] = ''
+        return formatted
+
+    @staticmethod
+    def _format_amounts(amounts: pd.Series) -> pd.Series:
+        """Format parsed amounts as 2-decimal strings (object Series on the same index)"""
+        # A plain map over Python floats avoids Series.map's per-element overhead
+        formatted = list(map('%.2f'.__mod__, amounts.to_numpy(dtype=float).tolist()))
+        return pd.Series(formatted, index=amounts.index, dtype=object)
+
+    def _parse_amount_column(self, values: pd.Series) -> pd.Series:
+        """Parse a column of amount cells to floats (0.0 for anything unparseable)"""
+        kinds = values.map(type)
+        is_str = kinds == str
+        is_number = kinds.isin([int, float, bool])
+
+        amounts = pd.Series(0.0, index=values.index)
+        if is_number.any():
+            amounts[is_number] = values[is_number].astype(float)
+        if is_str.any():
+            amounts[is_str] = self._parse_amount_strings(values[is_str])
+
+        return amounts
+
+    def _parse_amount_strings(self, strings: pd.Series) -> pd.Series:
+        """Parse a series of amount strings (unparseable text counts as 0)"""
+        amounts = pd.Series(np.nan, index=strings.index)
+        if NUMBA_AVAILABLE:
+            encoded = [string.encode('utf-8') for string in strings]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(data) for data in encoded], out=offsets[1:])
+            buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            amounts[:] = _parse_amounts_jit(buffer, offsets)
+
+        # Remove common formatting from whatever the fast path could not parse
+        pending = amounts.isna()
+        if pending.any():
+            cleaned = strings[pending].str.replace(self._amount_clean_re, '', regex=True)
+            amounts[pending] = pd.to_numeric(cleaned, errors='coerce').astype(float)
+
+        return amounts.fillna(0.0)
 
     def _standardize_date(self, date_value, target_format: str = 'DD/MM/YYYY') -> str:
         """Standardize date format"""
+        return self._format_date(self._parse_date(date_value), date_value, target_format)
+
+    def _parse_date(self, date_value) -> Optional[datetime]:
+        """Parse a raw cell into a datetime, or None if it is not a date"""
         if not date_value:
-            return ''
+            return None
 
         try:
             # Handle Excel serial dates
             if isinstance(date_value, (int, float)) and date_value > 1000:
-                # Excel date serial number (days since 1900-01-01)
-                excel_epoch = datetime(1900, 1, 1)
-                date_obj = excel_epoch + pd.Timedelta(days=date_value - 2)  # Excel has a leap year bug
+                # Excel date serial number; the 1899-12-30 origin absorbs Excel's 1900 leap year bug
+                date_obj = datetime(1899, 12, 30) + timedelta(days=date_value)
             elif isinstance(date_value, str):
                 # Try to parse string dates
-                date_obj = pd.to_datetime(date_value, errors='coerce')
+                date_obj = pd.to_datetime(date_value, dayfirst=not self._year_first_re.match(date_value),
+                                          errors='coerce')
             elif isinstance(date_value, datetime):
                 date_obj = date_value
             else:
-                return str(date_value)
+                return None
 
-            if pd.isna(date_obj):
-                return str(date_value)
+            return None if pd.isna(date_obj) else date_obj
 
-            # Format according to target format
-            if target_format == 'DD/MM/YYYY':
-                return date_obj.strftime('%d/%m/%Y')
-            elif target_format == 'MM/DD/YYYY':
-                return date_obj.strftime('%m/%d/%Y')
-            elif target_format == 'YYYY-MM-DD':
-                return date_obj.strftime('%Y-%m-%d')
-            else:
-                return date_obj.strftime('%d/%m/%Y')
+        except Exception:
+            return None
+
+    def _format_date(self, date_obj: Optional[datetime], date_value, target_format: str = 'DD/MM/YYYY') -> str:
+        """Format a parsed date, falling back to the raw value"""
+        if not date_value:
+            return ''
+
+        if date_obj is None:
+            return str(date_value)
 
+        try:
+            # Format according to target format
+            return date_obj.strftime(self.date_formats.get(target_format, '%d/%m/%Y'))
         except Exception:
             return str(date_value)
 
@@ -390,7 +767,7 @@ class BankStatementTransformer:
             return 0.0
 
         # Remove common formatting
-        cleaned = re.sub(r'[₦$£€,\s()]', '', str(value))
+        cleaned = self._amount_clean_re.sub('', value)
 
         try:
             return float(cleaned)
@@ -403,7 +780,8 @@ class BankStatementTransformer:
             return True  # Likely Excel serial date
 
         if isinstance(value, str):
-            return any(re.match(pattern, value) for pattern in self.date_patterns)
+            # Every date pattern has a separator, so skip the regex for plain text
+            return ('/' in value or '-' in value) and bool(self._date_re.match(value))
 
         return isinstance(value, datetime)
 
@@ -413,7 +791,11 @@ class BankStatementTransformer:
             return value != 0
 
         if isinstance(value, str):
-            cleaned = re.sub(r'[₦$£€,\s()]', '', value)
+            # Descriptions make up most string cells; without a digit they cannot be amounts
+            if not any(ch.isdigit() for ch in value):
+                return False
+
+            cleaned = self._amount_clean_re.sub('', value)
             try:
                 return float(cleaned) != 0
             except ValueError:
@@ -426,11 +808,30 @@ class BankStatementTransformer:
         if options is None:
             options = {}
 
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        transactions = transformed_data['transactions']
+        headers = self.standard_headers
+
+        # xlsxwriter drops rows past the limit instead of raising, so refuse up front
+        if len(transactions) >= MAX_EXCEL_ROWS:
+            raise ValueError(f"{len(transactions)} transactions do not fit in one worksheet "
+                             f"(max {MAX_EXCEL_ROWS - 1})")
+
+        # xlsxwriter's constant_memory mode flushes each row to disk as soon as the next
+        # one starts, so every sheet is written strictly row by row with write_row
+        workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'strings_to_formulas': False,  # Statement text is data, never formulas
+            'strings_to_urls': False,  # ...or hyperlinks (also avoids the per-sheet URL limit)
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        try:
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+
             # Create transactions sheet
-            transactions_df = pd.DataFrame(transformed_data['transactions'])
-            transactions_df = transactions_df[self.standard_headers]  # Ensure correct column order
-            transactions_df.to_excel(writer, sheet_name='Transactions', index=False)
+            worksheet = workbook.add_worksheet('Transactions')
+            self._write_row(worksheet, 0, headers, header_format)
+            for row, transaction in enumerate(transactions, start=1):
+                self._write_row(worksheet, row, [self._excel_value(transaction.get(header, '')) for header in headers])
 
             # Create metadata sheet if requested
             if options.get('include_metadata', True) and transformed_data.get('account_info'):
@@ -444,14 +845,72 @@ class BankStatementTransformer:
                     ['Processing Information', ''],
                     ['Original Format', transformed_data['original_format']],
                     ['Records Processed', transformed_data['records_processed']],
+                    ['Date Range Start', transformed_data['metadata'].get('date_range_start', '')],
+                    ['Date Range End', transformed_data['metadata'].get('date_range_end', '')],
                     ['Processed At', transformed_data['metadata']['processed_at']]
                 ]
 
-                metadata_df = pd.DataFrame(metadata, columns=['Field', 'Value'])
-                metadata_df.to_excel(writer, sheet_name='Metadata', index=False)
+                worksheet = workbook.add_worksheet('Metadata')
+                self._write_row(worksheet, 0, ['Field', 'Value'], header_format)
+                for row, (field, value) in enumerate(metadata, start=1):
+                    self._write_row(worksheet, row, [field, self._excel_value(value)])
+        finally:
+            workbook.close()
+
+        # Columnar copy of the transactions for fast previews (optional)
+        try:
+            transactions_df = pd.DataFrame(transactions, columns=headers)
+            transactions_df.astype('string').to_parquet(
+                output_path + '.parquet', engine='pyarrow', compression='zstd', index=False
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not write parquet copy of {output_path}: {e}")
 
         self.logger.info(f"Standardized file saved to: {output_path}")
 
+    @staticmethod
+    def _write_row(worksheet, row: int, values: List, cell_format=None):
+        """Write one worksheet row, raising where xlsxwriter would drop or truncate it"""
+        status = worksheet.write_row(row, 0, values, cell_format)
+        if status == -1:
+            raise ValueError(f"Row {row} is past the {worksheet.name} sheet's row limit")
+        if status == -2:
+            raise ValueError(f"Row {row} of the {worksheet.name} sheet has a cell over "
+                             f"{MAX_EXCEL_CELL_CHARS} characters")
+        if status < 0:
+            raise ValueError(f"Could not write row {row} of the {worksheet.name} sheet (xlsxwriter error {status})")
+
+    @staticmethod
+    def _excel_value(value):
+        """Blank out values a worksheet cell cannot hold (None, NaN, infinities)"""
+        if value is None or (isinstance(value, float) and not np.isfinite(value)):
+            return ''
+        return value
+
+    def _date_range(self, dates: pd.Series, target_format: str = 'DD/MM/YYYY') -> Tuple[str, str]:
+        """Return the first and last of the parsed transaction dates, formatted"""
+        dates = dates.dropna()
+        if dates.empty:
+            return '', ''
+
+        try:
+            fmt = self.date_formats.get(target_format, '%d/%m/%Y')
+            return dates.min().strftime(fmt), dates.max().strftime(fmt)
+        except Exception:
+            return '', ''
+
+
+# Transformer of the current worker process, built on its first file
+_worker_transformer = None
+
+
+def _worker_transform(file_path: str, options: Optional[Dict] = None) -> Dict:
+    """Transform one statement in a batch worker process"""
+    global _worker_transformer
+    if _worker_transformer is None:
+        _worker_transformer = BankStatementTransformer()
+    return _worker_transformer.transform_statement(file_path, options)
+
 
 # Example usage
 if __name__ == "__main__":
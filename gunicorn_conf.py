@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for Nigerian Bank Statement Transformer
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+# Bind to the platform-provided port when there is one
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# gevent workers monkey-patch socket I/O themselves, so slow uploads and
+# downloads no longer tie up a whole worker
+worker_class = 'gevent'
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, multiprocessing.cpu_count() * 2)))
+worker_connections = 1000
+
+# Large statements can take a while to transform
+timeout = 120
+
+# Workers must share one upload folder: a file transformed by one worker is
+# previewed and downloaded through whichever worker gets the next request.
+# The config is loaded in the master, so workers inherit this folder.
+if not os.environ.get('UPLOAD_FOLDER'):
+    os.environ['UPLOAD_FOLDER'] = tempfile.mkdtemp(prefix='bank-transformer-')
+
+
+def post_worker_init(worker):
+    """Start the upload folder janitor in each worker (only the lock holder cleans)"""
+    from app import _start_janitor
+    _start_janitor()
@@ -0,0 +1,356 @@
+"""
+Flask API tests for the bank statement transformer
+"""
+
+import io
+import json
+import os
+import time
+
+import openpyxl
+import pytest
+
+import app as app_module
+
+
+STATEMENT_ROWS = [
+    ['Date', 'Description', 'Debit', 'Credit', 'Balance'],
+    ['01/02/2024', 'POS PURCHASE', '50.00', None, '950.00'],
+    ['02/02/2024', 'TRANSFER IN', None, '100.00', '1,050.00'],
+    ['13/02/2024', 'ATM WITHDRAWAL', '20.00', None, '1,030.00'],
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    upload_folder = tmp_path / 'uploads'
+    upload_folder.mkdir()
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(upload_folder))
+    monkeypatch.setitem(app_module.app.config, 'CELERY_BROKER_URL', None)
+    app_module._build_preview.cache_clear()
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def statement(tmp_path):
+    workbook = openpyxl.Workbook()
+    for row in STATEMENT_ROWS:
+        workbook.active.append(row)
+    path = tmp_path / 'statement.xlsx'
+    workbook.save(path)
+    return path
+
+
+def _upload(client, statement, **form):
+    with open(statement, 'rb') as f:
+        response = client.post('/api/transform', data={'files': [(f, 'statement.xlsx')], **form},
+                               content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response.get_json()['results'][0]
+
+
+def _upload_path(file_name):
+    return os.path.join(app_module.app.config['UPLOAD_FOLDER'], file_name)
+
+
+# Content-addressed outputs
+
+def test_identical_reupload_is_served_from_cache(client, statement):
+    first = _upload(client, statement, date_format='DD/MM/YYYY')
+    second = _upload(client, statement, date_format='DD/MM/YYYY')
+
+    assert first['success'] and 'cached' not in first
+    assert second['cached'] is True
+    assert second['output_file'] == first['output_file']
+    assert set(second) - {'cached'} == set(first)
+    assert second['transactions'] == first['transactions']
+
+
+def test_options_are_part_of_the_output_key(client, statement):
+    day_first = _upload(client, statement, date_format='DD/MM/YYYY')
+    year_first = _upload(client, statement, date_format='YYYY-MM-DD')
+
+    assert year_first['output_file'] != day_first['output_file']
+    assert 'cached' not in year_first
+
+    previews = [client.get(f"/api/preview/{result['output_file']}").get_json()
+                for result in (day_first, year_first)]
+    assert [preview['data'][0]['Tran Date'] for preview in previews] == ['01/02/2024', '2024-02-01']
+
+
+def test_xlsx_is_published_after_its_sidecars(client, statement, monkeypatch):
+    published = []
+    replace = os.replace
+
+    def record_replace(source, destination):
+        published.append(os.path.basename(destination))
+        replace(source, destination)
+
+    monkeypatch.setattr(app_module.os, 'replace', record_replace)
+    result = _upload(client, statement)
+
+    output_file = result['output_file']
+    assert published[-1] == output_file
+    assert set(published[:-1]) == {f"{output_file}.parquet", f"{output_file}.meta.json",
+                                   f"{output_file}.preview.json"}
+
+
+# Compression
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+def test_index_page_is_compressed(client, encoding):
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    response = client.get('/', headers={'Accept-Encoding': encoding})
+
+    assert response.headers.get('Content-Encoding') == encoding
+    assert len(response.data) < len(plain.data)
+
+
+def test_json_responses_are_compressed(client, statement):
+    result = _upload(client, statement)
+    response = client.get(f"/api/preview/{result['output_file']}", headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers.get('Content-Encoding') == 'gzip'
+
+
+# Preview
+
+def _fail(*args, **kwargs):
+    raise AssertionError('the workbook should not be read')
+
+
+def test_preview_is_served_from_the_preview_sidecar(client, statement, monkeypatch):
+    result = _upload(client, statement)
+    monkeypatch.setattr(app_module.pd, 'read_excel', _fail)
+    monkeypatch.setattr(app_module.pq, 'ParquetFile', _fail)
+
+    preview = client.get(f"/api/preview/{result['output_file']}").get_json()
+
+    assert preview['success']
+    assert preview['total_records'] == 3
+    assert preview['format'] == 'Generic Bank Format'
+    assert preview['date_range'] == '01/02/2024 to 13/02/2024'
+    assert preview['data'][0]['Transaction Details'] == 'POS PURCHASE'
+
+
+def test_preview_is_cached_per_file_version(client, statement):
+    result = _upload(client, statement)
+    output_path = _upload_path(result['output_file'])
+    url = f"/api/preview/{result['output_file']}"
+
+    first = client.get(url).get_json()
+    os.remove(f"{output_path}.preview.json")
+    assert client.get(url).get_json() == first  # Same mtime: served from memory
+
+    os.utime(output_path, (0, 0))
+    rebuilt = client.get(url).get_json()  # New mtime: rebuilt from the parquet copy
+    assert rebuilt['data'] == first['data']
+    assert rebuilt['total_records'] == first['total_records']
+    assert app_module._build_preview.cache_info().currsize == 2
+
+
+def test_preview_metadata_comes_from_the_meta_sidecar(client, statement, monkeypatch):
+    result = _upload(client, statement, date_format='YYYY-MM-DD')
+    os.remove(f"{_upload_path(result['output_file'])}.preview.json")
+    monkeypatch.setattr(app_module.pd, 'read_excel', _fail)
+
+    preview = client.get(f"/api/preview/{result['output_file']}").get_json()
+
+    assert preview['success']
+    assert preview['format'] == 'Generic Bank Format'
+    assert preview['total_records'] == 3
+    assert preview['date_range'] == '2024-02-01 to 2024-02-13'
+
+
+
+def _count_workbook_opens(monkeypatch):
+    opens = []
+    excel_file = app_module.pd.ExcelFile
+
+    def counting_excel_file(*args, **kwargs):
+        opens.append(args[0])
+        return excel_file(*args, **kwargs)
+
+    monkeypatch.setattr(app_module.pd, 'ExcelFile', counting_excel_file)
+    monkeypatch.setattr(app_module.pd, 'read_excel', _fail)
+    return opens
+
+
+def test_legacy_preview_opens_the_workbook_once(client, statement, monkeypatch):
+    result = _upload(client, statement, include_metadata='true')
+    output_path = _upload_path(result['output_file'])
+    for suffix in ('.parquet', '.meta.json', '.preview.json'):
+        os.remove(f"{output_path}{suffix}")
+    opens = _count_workbook_opens(monkeypatch)
+
+    preview = client.get(f"/api/preview/{result['output_file']}").get_json()
+
+    assert len(opens) == 1
+    assert preview['format'] == 'Generic Bank Format'
+    assert preview['total_records'] == 3
+    assert preview['date_range'] == '01/02/2024 to 13/02/2024'
+    assert preview['data'][1]['Transaction Details'] == 'TRANSFER IN'
+
+
+def test_legacy_preview_falls_back_to_the_first_sheet(client, monkeypatch):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = 'Sheet1'
+    for row in [['Tran Date', 'Debit'], ['01/02/2024', '5.00'], ['02/02/2024', '7.00']]:
+        workbook.active.append(row)
+    workbook.save(_upload_path('standardized_legacy.xlsx'))
+    opens = _count_workbook_opens(monkeypatch)
+
+    preview = client.get('/api/preview/standardized_legacy.xlsx').get_json()
+
+    assert len(opens) == 1
+    assert preview['headers'] == ['Tran Date', 'Debit']
+    assert preview['total_records'] == 2
+    assert preview['format'] == 'Standardized'
+
+# Upload folder expiry
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_janitor_removes_only_expired_files(client):
+    upload_folder = app_module.app.config['UPLOAD_FOLDER']
+    for name in ('old.xlsx', 'fresh.xlsx', 'old.lock'):
+        open(os.path.join(upload_folder, name), 'w').close()
+    _age(os.path.join(upload_folder, 'old.xlsx'), app_module.UPLOAD_TTL_SECONDS + 1)
+    _age(os.path.join(upload_folder, 'old.lock'), app_module.UPLOAD_TTL_SECONDS + 1)
+
+    app_module._expire_uploads(upload_folder)
+
+    assert sorted(os.listdir(upload_folder)) == ['fresh.xlsx', 'old.lock']
+
+
+@pytest.mark.skipif(app_module.fcntl is None, reason='needs flock')
+def test_only_one_janitor_holds_the_lock(client):
+    upload_folder = app_module.app.config['UPLOAD_FOLDER']
+
+    holder = app_module._acquire_janitor_lock(upload_folder)
+    assert holder is not None
+    assert app_module._acquire_janitor_lock(upload_folder) is None
+
+    holder.close()  # The holder exited
+    successor = app_module._acquire_janitor_lock(upload_folder)
+    assert successor is not None
+    successor.close()
+
+def test_cache_hit_restarts_the_expiry_clock(client, statement):
+    result = _upload(client, statement)
+    output_path = _upload_path(result['output_file'])
+    companions = [output_path] + [f"{output_path}{suffix}" for suffix in ('.parquet', '.meta.json', '.preview.json')]
+    for path in companions:
+        _age(path, app_module.UPLOAD_TTL_SECONDS - 60)
+
+    assert _upload(client, statement)['cached'] is True
+    app_module._expire_uploads(app_module.app.config['UPLOAD_FOLDER'])
+
+    assert all(os.path.exists(path) for path in companions)
+
+
+# Upload limits
+
+@pytest.mark.parametrize('url, kwargs', [
+    ('/api/transform', {'data': {'files': [(io.BytesIO(b'x' * 4096), 'statement.xlsx')]},
+                        'content_type': 'multipart/form-data'}),
+    ('/api/transform_stream', {'data': b'x' * 4096, 'headers': {'X-Filename': 'statement.xlsx'},
+                               'content_type': 'application/octet-stream'}),
+])
+def test_oversize_uploads_are_rejected_before_reading(client, monkeypatch, url, kwargs):
+    monkeypatch.setitem(app_module.app.config, 'MAX_CONTENT_LENGTH', 1024)
+
+    response = client.post(url, **kwargs)
+
+    assert response.status_code == 413
+    assert response.get_json()['success'] is False
+    assert os.listdir(app_module.app.config['UPLOAD_FOLDER']) == []
+
+
+# Streamed uploads
+
+def test_stream_upload_is_transformed(client, statement):
+    response = client.post('/api/transform_stream?date_format=YYYY-MM-DD', data=statement.read_bytes(),
+                           headers={'X-Filename': 'my%20statement.xlsx'}, content_type='application/octet-stream')
+
+    result = response.get_json()['results'][0]
+    assert result['success']
+    assert result['metadata']['file_name'] == 'my statement.xlsx'
+    assert result['transactions'][0]['Tran Date'] == '2024-02-01'
+    assert os.path.exists(_upload_path(result['output_file']))
+
+
+def test_stream_upload_needs_an_octet_stream_body(client, statement):
+    response = client.post('/api/transform_stream', data=statement.read_bytes(),
+                           headers={'X-Filename': 'statement.xlsx'}, content_type='text/plain')
+
+    assert response.status_code == 415
+
+
+def test_stream_upload_checks_the_extension(client):
+    response = client.post('/api/transform_stream', data=b'x', headers={'X-Filename': 'notes.txt'},
+                           content_type='application/octet-stream')
+
+    assert response.get_json()['results'] == [
+        {'success': False, 'error': 'Invalid file format', 'file_name': 'notes.txt'}
+    ]
+
+
+# Background jobs
+
+class _FinishedJob:
+    """Stands in for a Celery AsyncResult whose task has finished"""
+
+    state = 'SUCCESS'
+
+    def __init__(self, result):
+        self.result = json.loads(json.dumps(result))  # As stored by the result backend
+
+    def successful(self):
+        return True
+
+    def failed(self):
+        return False
+
+
+@pytest.fixture
+def celery_jobs(monkeypatch):
+    jobs = {}
+
+    def delay(*args):
+        jobs['job-1'] = app_module.transform_task.run(*args)
+        return type('Job', (), {'id': 'job-1'})
+
+    monkeypatch.setitem(app_module.app.config, 'CELERY_BROKER_URL', 'memory://')
+    monkeypatch.setattr(app_module.transform_task, 'delay', delay)
+    monkeypatch.setattr(app_module.transform_task, 'AsyncResult', lambda job_id: _FinishedJob(jobs[job_id]))
+    return jobs
+
+
+def test_job_results_keep_transactions_out_of_the_backend(client, statement, celery_jobs):
+    with open(statement, 'rb') as f:
+        response = client.post('/api/transform', data={'files': [(f, 'statement.xlsx')]},
+                               content_type='multipart/form-data')
+
+    assert response.status_code == 202
+    assert response.get_json()['job_id'] == 'job-1'
+    assert 'transactions' not in celery_jobs['job-1']['results'][0]
+
+    job = client.get('/api/job/job-1').get_json()
+    assert job['state'] == 'SUCCESS'
+    result = job['result']['results'][0]
+    assert result['success'] and result['download_ready']
+    assert [row['Transaction Details'] for row in result['transactions']] == [
+        'POS PURCHASE', 'TRANSFER IN', 'ATM WITHDRAWAL'
+    ]
+
+
+def test_process_executor_falls_back_to_threads_in_daemon_processes(client, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'TRANSFORM_EXECUTOR', 'process')
+    monkeypatch.setattr(app_module, '_in_daemon_process', lambda: True)
+
+    with app_module._create_executor(2) as executor:
+        assert isinstance(executor, app_module.ThreadPoolExecutor)
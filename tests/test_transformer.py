@@ -0,0 +1,178 @@
+"""
+Behaviour tests for the bank statement transformation engine
+"""
+
+import math
+
+import openpyxl
+import pytest
+
+import bank_transformer
+from bank_transformer import BankStatementTransformer, _RawRows
+
+
+@pytest.fixture(scope='module')
+def transformer():
+    return BankStatementTransformer()
+
+
+def _transform_rows(transformer, rows, mapping, options=None):
+    """Run extraction and standardization on raw rows whose first row is the header"""
+    format_info = {'header_row': 0, 'mapping': mapping}
+    transactions = transformer._extract_transactions(_RawRows(rows), format_info)
+    return transformer._standardize_transactions(transactions, format_info, options or {})
+
+
+# Dates
+
+def test_text_dates_are_day_first(transformer):
+    records, date_range = _transform_rows(
+        transformer,
+        [['Date', 'Amount'], ['03/04/2024', '10.00'], ['13/04/2024', '5.00']],
+        {'Date': 'Tran Date'}
+    )
+
+    assert [record['Tran Date'] for record in records] == ['03/04/2024', '13/04/2024']
+    assert date_range == ('03/04/2024', '13/04/2024')
+
+
+def test_year_first_text_dates_keep_month_second(transformer):
+    records, _ = _transform_rows(
+        transformer,
+        [['Date', 'Amount'], ['2024-04-03', '10.00']],
+        {'Date': 'Tran Date'},
+        {'date_format': 'YYYY-MM-DD'}
+    )
+
+    assert records[0]['Tran Date'] == '2024-04-03'
+
+
+def test_excel_serial_dates(transformer):
+    records, _ = _transform_rows(
+        transformer,
+        [['Date', 'Amount'], [45385, '10.00']],
+        {'Date': 'Tran Date'}
+    )
+
+    assert records[0]['Tran Date'] == '03/04/2024'
+    assert transformer._standardize_date(45385) == '03/04/2024'
+
+
+# Amounts
+
+def test_nan_cells_standardize_to_empty(transformer):
+    # Empty .ods cells are read as NaN
+    records, _ = _transform_rows(
+        transformer,
+        [['Date', 'Details', 'Debit', 'Credit'], ['03/04/2024', math.nan, '1,200.50', math.nan]],
+        {'Date': 'Tran Date', 'Details': 'Transaction Details', 'Debit': 'Debit', 'Credit': 'Credit'}
+    )
+
+    assert records[0]['Transaction Details'] == ''
+    assert records[0]['Debit'] == '1200.50'
+    assert records[0]['Credit'] == ''
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', 'Infinity', 'POS PURCHASE', ''])
+def test_text_without_digits_is_not_an_amount(transformer, value):
+    assert not transformer._is_amount(value)
+
+
+@pytest.mark.parametrize('value', ['₦1,200.50', '(50.00)', '-12.5', 7])
+def test_amounts_are_recognised(transformer, value):
+    assert transformer._is_amount(value)
+
+
+def test_rows_without_dates_or_amounts_are_skipped(transformer):
+    records, _ = _transform_rows(
+        transformer,
+        [['Details', 'Balance'], ['Opening note', 'nan'], ['POS PURCHASE', '1,000.00']],
+        {'Details': 'Transaction Details', 'Balance': 'Balance'}
+    )
+
+    assert records == [{
+        'Tran Date': '', 'Value Date': '', 'Ref. No': '', 'Transaction Details': 'POS PURCHASE',
+        'Debit': '', 'Credit': '', 'Balance': '1000.00'
+    }]
+
+
+def test_signed_amount_splits_into_debit_and_credit(transformer):
+    records, _ = _transform_rows(
+        transformer,
+        [['Date', 'Amount'], ['01/02/2024', -50.5], ['02/02/2024', '1,000.00'], ['03/02/2024', '₦-20']],
+        {'Date': 'Tran Date'}
+    )
+
+    assert [(record['Debit'], record['Credit']) for record in records] == [
+        ('50.50', ''), ('', '1000.00'), ('20.00', '')
+    ]
+
+
+def test_signed_amount_does_not_override_debit_credit_columns(transformer):
+    records, _ = _transform_rows(
+        transformer,
+        [['Date', 'Withdrawal', 'Amount'], ['01/02/2024', '75.00', '-50.00']],
+        {'Date': 'Tran Date', 'Withdrawal': 'Debit'}
+    )
+
+    assert (records[0]['Debit'], records[0]['Credit']) == ('75.00', '')
+
+
+# Files
+
+def _standardized_result(transactions):
+    return {
+        'transactions': transactions,
+        'account_info': {},
+        'original_format': 'Generic Bank Format',
+        'records_processed': len(transactions),
+        'metadata': {'date_range_start': '', 'date_range_end': ''}
+    }
+
+
+def test_reads_the_active_sheet(transformer, tmp_path):
+    workbook = openpyxl.Workbook()
+    workbook.active['A1'] = 'Cover page'
+    statement = workbook.create_sheet('Statement')
+    for row in [['Date', 'Description', 'Debit', 'Credit', 'Balance'],
+                ['01/02/2024', 'POS PURCHASE', '50.00', None, '950.00'],
+                ['02/02/2024', 'TRANSFER IN', None, '100.00', '1,050.00']]:
+        statement.append(row)
+    workbook.active = 1
+    path = tmp_path / 'statement.xlsx'
+    workbook.save(path)
+
+    result = transformer.transform_statement(str(path))
+
+    assert result['success'], result.get('error')
+    assert result['records_processed'] == 2
+
+
+def test_output_keeps_urls_as_text(transformer, tmp_path):
+    output_path = tmp_path / 'standardized.xlsx'
+    transformer.generate_standardized_file(
+        _standardized_result([{'Tran Date': '01/02/2024', 'Transaction Details': 'https://example.com/pay'}]),
+        str(output_path)
+    )
+
+    cell = openpyxl.load_workbook(output_path)['Transactions']['D2']
+    assert cell.value == 'https://example.com/pay'
+    assert cell.hyperlink is None
+
+
+def test_output_refuses_to_truncate_long_cells(transformer, tmp_path):
+    narration = 'X' * (bank_transformer.MAX_EXCEL_CELL_CHARS + 1)
+
+    with pytest.raises(ValueError, match='characters'):
+        transformer.generate_standardized_file(
+            _standardized_result([{'Transaction Details': narration}]), str(tmp_path / 'long.xlsx')
+        )
+
+
+def test_output_refuses_more_rows_than_a_sheet_holds(transformer, tmp_path, monkeypatch):
+    monkeypatch.setattr(bank_transformer, 'MAX_EXCEL_ROWS', 3)
+
+    with pytest.raises(ValueError, match='do not fit'):
+        transformer.generate_standardized_file(
+            _standardized_result([{'Debit': '1.00'}] * 3), str(tmp_path / 'rows.xlsx')
+        )